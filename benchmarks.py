@@ -0,0 +1,250 @@
+# benchmarks.py
+import random
+import time
+import tracemalloc
+from itertools import accumulate
+
+from memory_manager import METHODS, MemoryManager
+from paging import REPLACEMENT_POLICIES, VirtualMemory, reference_string
+from process_table import ProcessTable
+from scheduler import ProcessScheduler, batch_schedule, np
+from tlb import TLB
+
+
+def bench_round_robin_step(sizes=(100, 10_000, 100_000, 1_000_000), steps=10_000):
+    """Time round_robin_step once every process has arrived"""
+    results = []
+    for size in sizes:
+        scheduler = ProcessScheduler()
+        scheduler.quantum = 1
+        for i in range(size):
+            scheduler.add_process(f"P{i}", steps)
+
+        # The first step drains all arrivals; only steady-state slices are timed
+        scheduler.round_robin_step()
+        start = time.perf_counter()
+        for _ in range(steps):
+            scheduler.round_robin_step()
+        elapsed = time.perf_counter() - start
+
+        results.append({'processes': size, 'us_per_step': elapsed / steps * 1e6})
+    return results
+
+
+def bench_process_table_memory(size=1_000_000):
+    """Compare bytes per process for dict records and the column table (one shared name string)"""
+    def measure(build):
+        tracemalloc.start()
+        records = build()
+        used = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del records
+        return used / size
+
+    def build_dicts():
+        return [{
+            'pid': i + 1,
+            'name': "job",
+            'burst_time': 1000 + i % 500,
+            'remaining_time': 1000 + i % 500,
+            'priority': 0,
+            'arrival_time': i,
+            'status': 'Ready',
+            'start_time': None,
+            'end_time': None
+        } for i in range(size)]
+
+    def build_table():
+        table = ProcessTable()
+        for i in range(size):
+            table.append(i + 1, "job", 1000 + i % 500, 0, i)
+        return table
+
+    dict_bytes = measure(build_dicts)
+    table_bytes = measure(build_table)
+    return [{
+        'processes': size,
+        'dict_bytes': dict_bytes,
+        'table_bytes': table_bytes,
+        'ratio': dict_bytes / table_bytes,
+    }]
+
+
+def bench_batch_schedule(size=10_000_000, seed=0):
+    """Time batch FCFS and SJF, the latter with simultaneous and with staggered arrivals"""
+    rng = random.Random(seed)
+    arrivals = list(accumulate(rng.randint(0, 4) for _ in range(size)))
+    bursts = [rng.randint(1, 8) for _ in range(size)]
+    together = [0] * size
+    if np is not None:
+        arrivals = np.array(arrivals, dtype=np.int64)
+        bursts = np.array(bursts, dtype=np.int64)
+        together = np.zeros(size, dtype=np.int64)
+
+    results = []
+    for policy, trace, staggered in (('FCFS', arrivals, True), ('SJF', together, False),
+                                     ('SJF', arrivals, True)):
+        start = time.perf_counter()
+        batch_schedule(trace, bursts, policy)
+        results.append({
+            'policy': policy,
+            'arrivals': 'staggered' if staggered else 'together',
+            'jobs': size,
+            'vectorized': np is not None and not (policy == 'SJF' and staggered),
+            'seconds': time.perf_counter() - start,
+        })
+    return results
+
+
+def bench_smp(core_counts=(1, 16, 256), processes=50_000, seed=0):
+    """Per-slice engine cost and work stealing as the core count grows"""
+    results = []
+    for cores in core_counts:
+        for mode in ('global', 'per-cpu'):
+            rng = random.Random(seed)
+            scheduler = ProcessScheduler(cores=cores, queue_mode=mode, history_limit=1024)
+            scheduler.quantum = 4
+            scheduler.set_policy('RR')
+            for i in range(processes):
+                scheduler.add_process(f"P{i}", rng.randint(1, 40))
+
+            start = time.perf_counter()
+            slices = scheduler.run_to_completion(collect=False)
+            elapsed = time.perf_counter() - start
+            stats = scheduler.load_balance_stats()
+            results.append({
+                'cores': cores,
+                'mode': mode,
+                'makespan': scheduler.current_time,
+                'us_per_slice': elapsed / slices * 1e6,
+                'steals': stats['steals'],
+                'balance_seconds': stats['balance_seconds'],
+            })
+    return results
+
+
+def allocation_stream(count, live_target, max_size, seed=0):
+    """Random ('alloc', size) / ('free', fraction) requests settling around `live_target` live allocations"""
+    rng = random.Random(seed)
+    live = 0
+    stream = []
+    for _ in range(count):
+        if live and rng.random() < live / (2 * live_target):
+            stream.append(('free', rng.random()))
+            live -= 1
+        else:
+            stream.append(('alloc', rng.randint(1, max_size)))
+            live += 1
+    return stream
+
+
+def bench_allocators(total_blocks=1 << 20, requests=200_000, max_size=512, live_target=3000, seed=0):
+    """Replay one request/free trace under each allocation method"""
+    stream = allocation_stream(requests, live_target, max_size, seed=seed)
+    results = []
+    for method, allocator in METHODS.items():
+        memory = MemoryManager(total_blocks, allocator=allocator, block_map=False)
+        live = []
+        failures = 0
+        external = []
+        elapsed = 0.0
+        for i, (kind, value) in enumerate(stream):
+            start = time.perf_counter()
+            if kind == 'alloc':
+                pid = memory.next_pid
+                if memory.allocate(value, method) is None:
+                    failures += 1
+                else:
+                    live.append(pid)
+            elif live:
+                index = int(value * len(live))
+                live[index], live[-1] = live[-1], live[index]
+                memory.release(live.pop())
+            elapsed += time.perf_counter() - start
+            if i % 100 == 0:
+                external.append(memory.fragmentation()['external'])
+
+        frag = memory.fragmentation()
+        results.append({
+            'method': method,
+            'us_per_request': elapsed / requests * 1e6,
+            'failures': failures,
+            'internal': frag['internal'],
+            'avg_external': sum(external) / len(external),
+            'external': frag['external'],
+            'free_runs': memory.holes()[0],
+        })
+    return results
+
+
+def bench_paging(accesses=2_000_000, pages=4096, frames=256, seed=0):
+    """Fault rate and per-access cost of each page replacement policy on one trace"""
+    refs = reference_string(accesses, pages, working_set=64, shift=0.0005, seed=seed)
+    results = []
+    for policy in REPLACEMENT_POLICIES:
+        vm = VirtualMemory(frames, policy=policy)
+        vm.add_process(1, pages)
+        start = time.perf_counter()
+        vm.run(refs, pid=1)
+        elapsed = time.perf_counter() - start
+        stats = vm.stats()
+        results.append({
+            'policy': policy,
+            'frames': frames,
+            'fault_rate': stats['fault_rate'],
+            'ns_per_access': elapsed / accesses * 1e9,
+        })
+    return results
+
+
+def bench_tlb(accesses=1_000_000, processes=4, pages=4096, frames=1024, seed=0):
+    """TLB hit rate, effective access time and lookup cost for interleaved process traces"""
+    per_process = accesses // processes
+    traces = [reference_string(per_process, pages, working_set=32, shift=0.001, seed=seed + p)
+              for p in range(processes)]
+    refs, pids = [], []
+    for offset in range(0, per_process, 100):
+        for pid, trace in enumerate(traces, 1):
+            chunk = trace[offset:offset + 100]
+            refs.extend(chunk)
+            pids.extend([pid] * len(chunk))
+
+    results = []
+    for entries, ways in ((16, 4), (64, 4), (64, 64)):
+        for replacement in ('LRU', 'Random'):
+            tlb = TLB(entries, ways, replacement)
+            vm = VirtualMemory(frames, policy='Clock', tlb=tlb)
+            for pid in range(1, processes + 1):
+                vm.add_process(pid, pages)
+            start = time.perf_counter()
+            vm.run(refs, pids)
+            elapsed = time.perf_counter() - start
+            stats = tlb.stats()
+            results.append({
+                'entries': entries,
+                'ways': ways,
+                'replacement': replacement,
+                'hit_rate': stats['hit_rate'],
+                'eat_ns': stats['effective_access_time'],
+                'ns_per_access': elapsed / len(refs) * 1e9,
+            })
+    return results
+
+
+def print_results(title, rows):
+    print(title)
+    for row in rows:
+        print("  " + ", ".join(
+            f"{key}={value:.3f}" if isinstance(value, float) else f"{key}={value}"
+            for key, value in row.items()
+        ))
+
+
+if __name__ == "__main__":
+    print_results("Round Robin step cost", bench_round_robin_step())
+    print_results("Per-process memory", bench_process_table_memory())
+    print_results("Batch scheduling", bench_batch_schedule())
+    print_results("Multi-core scheduling", bench_smp())
+    print_results("Memory allocators", bench_allocators())
+    print_results("Page replacement", bench_paging())
+    print_results("TLB", bench_tlb())
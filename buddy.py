@@ -0,0 +1,122 @@
+# buddy.py
+import heapq
+
+
+class BuddyAllocator:
+    """Binary buddy system over a range of blocks, with per-order free sets and min-heaps"""
+
+    def __init__(self, total_blocks):
+        self.total_blocks = total_blocks
+        self.max_order = total_blocks.bit_length()
+        self.clear()
+
+    def clear(self):
+        """Mark every block free"""
+        self.free_sets = [set() for _ in range(self.max_order)]
+        self.free_heaps = [[] for _ in range(self.max_order)]
+        self.free_blocks = 0
+        start = 0
+        for order in reversed(range(self.max_order)):
+            if self.total_blocks >> order & 1:
+                self.add(start, order)
+                start += 1 << order
+
+    @staticmethod
+    def order_for(size):
+        """Smallest order whose block holds `size` blocks"""
+        return (size - 1).bit_length()
+
+    def block_size(self, size):
+        """Blocks actually handed out for a request of `size`"""
+        return 1 << self.order_for(size)
+
+    def add(self, start, order):
+        free, heap = self.free_sets[order], self.free_heaps[order]
+        free.add(start)
+        heapq.heappush(heap, start)
+        if len(heap) > 2 * len(free) + 64:
+            # Drop the entries of blocks taken since they were pushed
+            self.free_heaps[order] = heap = list(free)
+            heapq.heapify(heap)
+        self.free_blocks += 1 << order
+
+    def take(self, start, order):
+        self.free_sets[order].remove(start)
+        self.free_blocks -= 1 << order
+
+    def lowest(self, order):
+        """Lowest free block of `order`, dropping heap entries already taken"""
+        heap, free = self.free_heaps[order], self.free_sets[order]
+        while heap and heap[0] not in free:
+            heapq.heappop(heap)
+        return heap[0] if heap else None
+
+    def buddy_fit(self, size):
+        """Start of the block an allocation of `size` would use, or None"""
+        for order in range(self.order_for(size), self.max_order):
+            if self.free_sets[order]:
+                return self.lowest(order)
+        return None
+
+    def lowest_fit(self, size):
+        """Start of the lowest-addressed free block that holds `size`, or None"""
+        starts = [self.lowest(order) for order in range(self.order_for(size), self.max_order)
+                  if self.free_sets[order]]
+        return min(starts) if starts else None
+
+    def allocate(self, start, size):
+        """Take the aligned block of `size` (a power of two) at `start`, splitting larger blocks"""
+        order = self.order_for(size)
+        for containing in range(order, self.max_order):
+            block = start >> containing << containing
+            if block in self.free_sets[containing]:
+                break
+        else:
+            raise ValueError(f"Blocks {start}-{start + size - 1} are not free.")
+
+        self.take(block, containing)
+        while containing > order:
+            containing -= 1
+            half = block + (1 << containing)
+            if start >= half:
+                self.add(block, containing)
+                block = half
+            else:
+                self.add(half, containing)
+
+    def free(self, start, size):
+        """Return the block at `start`, merging it with free buddies"""
+        order = self.order_for(size)
+        while order + 1 < self.max_order:
+            buddy = start ^ (1 << order)
+            if buddy not in self.free_sets[order]:
+                break
+            self.take(buddy, order)
+            start = min(start, buddy)
+            order += 1
+        self.add(start, order)
+
+    def largest(self):
+        """Size of the largest free block"""
+        for order in reversed(range(self.max_order)):
+            if self.free_sets[order]:
+                return 1 << order
+        return 0
+
+    def __len__(self):
+        return sum(len(free) for free in self.free_sets)
+
+    def __iter__(self):
+        """Yield free runs as (start, length) in address order, adjacent blocks joined"""
+        blocks = sorted((start, 1 << order)
+                        for order, free in enumerate(self.free_sets) for start in free)
+        run_start = run_length = None
+        for start, length in blocks:
+            if run_start is not None and run_start + run_length == start:
+                run_length += length
+                continue
+            if run_start is not None:
+                yield run_start, run_length
+            run_start, run_length = start, length
+        if run_start is not None:
+            yield run_start, run_length
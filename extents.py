@@ -0,0 +1,254 @@
+# extents.py
+import random
+
+
+class ExtentNode:
+    __slots__ = ('key', 'length', 'priority', 'left', 'right', 'longest')
+
+    def __init__(self, key, length):
+        self.key = key
+        self.length = length
+        self.priority = random.random()
+        self.left = None
+        self.right = None
+        self.longest = length  # Longest length anywhere in this subtree
+
+    def update(self):
+        longest = self.length
+        if self.left and self.left.longest > longest:
+            longest = self.left.longest
+        if self.right and self.right.longest > longest:
+            longest = self.right.longest
+        self.longest = longest
+
+
+class ExtentTree:
+    """Treap of key: length, ordered by key, tracking the longest length in each subtree"""
+
+    def __init__(self):
+        self.root = None
+        self.size = 0
+
+    def split(self, node, key):
+        """Split into (keys < key, keys >= key)"""
+        if node is None:
+            return None, None
+        if node.key < key:
+            node.right, right = self.split(node.right, key)
+            node.update()
+            return node, right
+        left, node.left = self.split(node.left, key)
+        node.update()
+        return left, node
+
+    def merge(self, left, right):
+        """Join two treaps where every key in `left` is below every key in `right`"""
+        if left is None:
+            return right
+        if right is None:
+            return left
+        if left.priority > right.priority:
+            left.right = self.merge(left.right, right)
+            left.update()
+            return left
+        right.left = self.merge(left, right.left)
+        right.update()
+        return right
+
+    def insert(self, key, length):
+        left, right = self.split(self.root, key)
+        self.root = self.merge(self.merge(left, ExtentNode(key, length)), right)
+        self.size += 1
+
+    def remove(self, key):
+        """Delete `key`, which must be present"""
+        parent, node = None, self.root
+        path = []
+        while node.key != key:
+            path.append(node)
+            parent = node
+            node = node.left if key < node.key else node.right
+        child = self.merge(node.left, node.right)
+        if parent is None:
+            self.root = child
+        elif parent.left is node:
+            parent.left = child
+        else:
+            parent.right = child
+        for ancestor in reversed(path):
+            ancestor.update()
+        self.size -= 1
+
+    def first_fit(self, length):
+        """Lowest key whose length is at least `length`, or None"""
+        return self.fit_in(self.root, length)
+
+    def first_fit_from(self, key, length):
+        """Lowest key >= `key` whose length is at least `length`, or None"""
+        # Nodes where the search for `key` turns left are, deepest first,
+        # followed in key order by their right subtrees
+        node, after = self.root, []
+        while node:
+            if node.key < key:
+                node = node.right
+            else:
+                after.append(node)
+                node = node.left
+        for node in reversed(after):
+            if node.length >= length:
+                return node.key
+            if node.right and node.right.longest >= length:
+                return self.fit_in(node.right, length)
+        return None
+
+    def fit_in(self, node, length):
+        """Lowest key in the subtree at `node` whose length is at least `length`"""
+        if node is None or node.longest < length:
+            return None
+        while True:
+            if node.left and node.left.longest >= length:
+                node = node.left
+            elif node.length >= length:
+                return node.key
+            else:
+                node = node.right
+
+    def ceiling(self, key):
+        """Lowest key >= `key`, or None"""
+        node, found = self.root, None
+        while node:
+            if node.key < key:
+                node = node.right
+            else:
+                found = node.key
+                node = node.left
+        return found
+
+    def floor(self, key):
+        """Highest key <= `key`, or None"""
+        node, found = self.root, None
+        while node:
+            if key < node.key:
+                node = node.left
+            else:
+                found = node.key
+                node = node.right
+        return found
+
+    def longest(self):
+        return self.root.longest if self.root else 0
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        """Yield (key, length) in key order"""
+        return self.iter_from(None)
+
+    def iter_from(self, key):
+        """Yield (key, length) in key order, starting at the first key >= `key`"""
+        stack, node = [], self.root
+        if key is not None:
+            # Keep only the path nodes that are not below `key`
+            while node:
+                if node.key < key:
+                    node = node.right
+                else:
+                    stack.append(node)
+                    node = node.left
+        while stack or node:
+            while node:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            yield node.key, node.length
+            node = node.right
+
+
+class FreeExtents:
+    """Free space of a block range as maximal runs, indexed by start and by (length, start)"""
+
+    def __init__(self, total_blocks):
+        self.total_blocks = total_blocks
+        self.clear()
+
+    def clear(self):
+        """Mark every block free"""
+        self.starts = {}
+        self.ends = {}
+        self.by_start = ExtentTree()
+        self.by_size = ExtentTree()
+        self.free_blocks = 0
+        if self.total_blocks:
+            self.add(0, self.total_blocks)
+
+    def add(self, start, length):
+        self.starts[start] = length
+        self.ends[start + length] = start
+        self.by_start.insert(start, length)
+        self.by_size.insert((length, start), length)
+        self.free_blocks += length
+
+    def discard(self, start):
+        length = self.starts.pop(start)
+        del self.ends[start + length]
+        self.by_start.remove(start)
+        self.by_size.remove((length, start))
+        self.free_blocks -= length
+        return length
+
+    def first_fit(self, size):
+        """Start of the lowest free run of at least `size` blocks, or None"""
+        return self.by_start.first_fit(size)
+
+    def best_fit(self, size):
+        """Start of the smallest free run of at least `size` blocks (lowest on ties), or None"""
+        key = self.by_size.ceiling((size, -1))
+        return key[1] if key else None
+
+    def next_fit(self, size, rover):
+        """Start of the first free run of at least `size` blocks from `rover` on, wrapping around, or None"""
+        start = self.by_start.first_fit_from(rover, size)
+        if start is None:
+            start = self.by_start.first_fit(size)
+        return start
+
+    def worst_fit(self, size):
+        """Start of the largest free run (lowest on ties) if it holds `size` blocks, or None"""
+        longest = self.largest()
+        if longest < size:
+            return None
+        return self.by_size.ceiling((longest, -1))[1]
+
+    def allocate(self, start, size):
+        """Take blocks [start, start + size), which must lie inside one free run"""
+        run_start = self.by_start.floor(start)
+        if run_start is None or start + size > run_start + self.starts[run_start]:
+            raise ValueError(f"Blocks {start}-{start + size - 1} are not free.")
+        length = self.discard(run_start)
+        if start > run_start:
+            self.add(run_start, start - run_start)
+        if start + size < run_start + length:
+            self.add(start + size, run_start + length - start - size)
+
+    def free(self, start, size):
+        """Return blocks [start, start + size), merging with free neighbors"""
+        if start in self.ends:
+            before = self.ends[start]
+            size += start - before
+            self.discard(before)
+            start = before
+        if start + size in self.starts:
+            size += self.discard(start + size)
+        self.add(start, size)
+
+    def largest(self):
+        """Length of the longest free run"""
+        return self.by_start.longest()
+
+    def __len__(self):
+        return len(self.starts)
+
+    def __iter__(self):
+        """Yield free runs as (start, length) in address order"""
+        return iter(self.by_start)
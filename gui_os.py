@@ -3,7 +3,8 @@ import random
 from tkinter import ttk, messagebox
 from auth_system import login, register
 from file_system import create_file, read_file, delete_file, list_files, get_directory_structure
-from scheduler import ProcessScheduler
+from scheduler import ProcessScheduler, SchedulingMetrics
+from memory_manager import METHODS, MemoryManager
 
 class MiniOS:
     def __init__(self, root):
@@ -14,9 +15,8 @@ class MiniOS:
         self.root.configure(bg="#f0f2f5")
         self.current_user = None
         self.file_content = tk.StringVar()
-        self.memory_blocks = [None] * 100
+        self.memory = MemoryManager()
         self.alloc_method = tk.StringVar(value="First-Fit")
-        self.memory_allocations = []  # Stores dicts: {'pid': str, 'start': int, 'size': int, 'color': str}
         self.color_pool = ["#FF9999", "#99CCFF", "#99FF99", "#FFCC99", "#CCCCFF", "#FFFF99"]
         self.color_index = 0
 
@@ -680,7 +680,7 @@ class MiniOS:
         self.alloc_method = tk.StringVar(value="First-Fit")
         self.dealloc_pid = tk.StringVar()
 
-        ttk.Combobox(method_frame, textvariable=self.alloc_method, values=["First-Fit", "Best-Fit"], state="readonly", width=10).pack(side=tk.LEFT, padx=10)
+        ttk.Combobox(method_frame, textvariable=self.alloc_method, values=list(METHODS), state="readonly", width=10).pack(side=tk.LEFT, padx=10)
 
         ttk.Button(method_frame, text="Allocate Memory", command=self.allocate_memory).pack(side=tk.LEFT, padx=5)
 
@@ -690,16 +690,31 @@ class MiniOS:
         ttk.Button(method_frame, text="Release Memory", command=self.deallocate_memory).pack(side=tk.LEFT, padx=5)
         ttk.Button(method_frame, text="Compact Memory", command=self.compact_memory).pack(side=tk.LEFT, padx=5)
 
-        blocks_frame = tk.LabelFrame(
+        arena_frame = tk.Frame(container, bg=self.bg_color)
+        arena_frame.pack(fill=tk.X, pady=5)
+
+        tk.Label(arena_frame, text="Total blocks:", font=self.font_secondary, bg=self.bg_color).pack(side=tk.LEFT, padx=5)
+        self.mem_total = ttk.Entry(arena_frame, width=12)
+        self.mem_total.insert(0, str(self.memory.total_blocks))
+        self.mem_total.pack(side=tk.LEFT, padx=5)
+
+        tk.Label(arena_frame, text="Block size (KB):", font=self.font_secondary, bg=self.bg_color).pack(side=tk.LEFT, padx=5)
+        self.mem_block_size = ttk.Entry(arena_frame, width=6)
+        self.mem_block_size.insert(0, str(self.memory.block_size))
+        self.mem_block_size.pack(side=tk.LEFT, padx=5)
+
+        ttk.Button(arena_frame, text="New Arena", command=self.resize_memory).pack(side=tk.LEFT, padx=5)
+
+        self.blocks_frame = tk.LabelFrame(
             container,
-            text="Memory Blocks (100 blocks)",
+            text="Memory Blocks",
             font=self.font_secondary,
             bg=self.bg_color,
             fg=self.text_color
         )
-        blocks_frame.pack(fill=tk.BOTH, expand=True, pady=5)
+        self.blocks_frame.pack(fill=tk.BOTH, expand=True, pady=5)
 
-        self.mem_canvas = tk.Canvas(blocks_frame, bg="white", highlightthickness=0)
+        self.mem_canvas = tk.Canvas(self.blocks_frame, bg="white", highlightthickness=0)
         self.mem_canvas.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
 
         input_frame = tk.Frame(container, bg=self.bg_color)
@@ -734,6 +749,9 @@ class MiniOS:
 
         self.mem_log_table.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
 
+        self.mem_stats_label = tk.Label(table_frame, bg=self.bg_color, font=self.font_secondary, anchor="w")
+        self.mem_stats_label.pack(fill=tk.X, padx=5)
+
         self.refresh_memory_blocks()
 
     def refresh_memory_blocks(self):
@@ -744,28 +762,68 @@ class MiniOS:
         spacing = 5
         blocks_per_row = 10
 
+        # Large arenas are drawn as at most 100 cells of `span` blocks each
+        total = self.memory.total_blocks
+        span = -(-total // 100)
+        cells = -(-total // span)
+        rows = -(-cells // blocks_per_row)
+
         canvas_width = margin * 2 + (block_width + spacing) * blocks_per_row - spacing
-        canvas_height = margin * 2 + (block_height + spacing) * 10 - spacing
+        canvas_height = margin * 2 + (block_height + spacing) * rows - spacing
         self.mem_canvas.config(width=canvas_width, height=canvas_height)
+        self.blocks_frame.config(text=f"Memory Blocks ({total} blocks of {self.memory.block_size}KB)")
 
-        seen_pids = set()
-        for i in range(100):
+        for i in range(cells):
             row = i // blocks_per_row
             col = i % blocks_per_row
             x = margin + col * (block_width + spacing)
             y = margin + row * (block_height + spacing)
-            block = self.memory_blocks[i]
-            if block is None:
+            pid = self.memory.owner_of(i * span)
+            if pid is None:
                 fill_color = "white"
-                text = str(i)
+                text = str(i * span)
             else:
-                pid, fill_color = block
+                fill_color = self.memory.processes[pid]["color"]
                 text = f"P{pid}"
-                seen_pids.add(str(pid))
             self.mem_canvas.create_rectangle(x, y, x + block_width, y + block_height, fill=fill_color, outline="black")
             self.mem_canvas.create_text(x + block_width / 2, y + block_height / 2, text=text, font=("Segoe UI", 8))
 
-        self.dealloc_dropdown["values"] = sorted(list(seen_pids))
+        self.dealloc_dropdown["values"] = sorted(str(pid) for pid in self.memory.processes)
+
+        frag = self.memory.fragmentation()
+        stats = (
+            f"Free: {frag['free_blocks']} blocks (largest run {frag['largest_free']}) | "
+            f"Internal fragmentation: {frag['internal_blocks']} blocks ({frag['internal']:.0%}) | "
+            f"External: {frag['external']:.0%}"
+        )
+        counts = self.memory.stats()
+        stats += f" | Holes: {counts['free_holes']} | Allocations: {counts['allocations']} ({counts['failures']} failed)"
+        slabs = self.memory.slab_stats()
+        if slabs["slabs"]:
+            stats += f" | Slabs: {slabs['slabs']} ({slabs['utilization']:.0%} used)"
+        self.mem_stats_label.config(text=stats)
+
+    def refresh_memory_table(self):
+        for item in self.mem_log_table.get_children():
+            self.mem_log_table.delete(item)
+        for start, length, pid in self.memory.runs():
+            self.mem_log_table.insert("", tk.END, values=(pid, start, length, "Allocated"))
+
+    def resize_memory(self):
+        try:
+            total_blocks = int(self.mem_total.get())
+            block_size = int(self.mem_block_size.get())
+        except ValueError:
+            messagebox.showerror("Invalid Input", "Please enter numeric values.")
+            return
+        try:
+            memory = MemoryManager(total_blocks, block_size, allocator=METHODS[self.alloc_method.get()])
+        except ValueError as e:
+            messagebox.showerror("Invalid Arena", str(e))
+            return
+        self.memory = memory
+        self.refresh_memory_table()
+        self.refresh_memory_blocks()
 
     def allocate_memory(self):
         try:
@@ -775,60 +833,36 @@ class MiniOS:
             messagebox.showerror("Invalid Input", "Please enter numeric values.")
             return
 
-        if size <= 0 or size > 100:
-            messagebox.showerror("Invalid Size", "Size must be between 1 and 100 blocks.")
+        total = self.memory.total_blocks
+        if size <= 0 or size > total:
+            messagebox.showerror("Invalid Size", f"Size must be between 1 and {total} blocks.")
             return
 
-        if any(block and block[0] == pid for block in self.memory_blocks):
+        if pid in self.memory.processes:
             messagebox.showerror("Duplicate PID", f"P{pid} is already allocated.")
             return
 
+        # The buddy allocator manages the arena differently; switch only while it is empty
+        method = self.alloc_method.get()
+        if METHODS[method] != self.memory.allocator:
+            if self.memory.processes:
+                messagebox.showerror("Allocator In Use", f"Release all memory before switching to {method}.")
+                return
+            self.memory = MemoryManager(total, self.memory.block_size, allocator=METHODS[method])
+
         color = self.color_pool[self.color_index % len(self.color_pool)]
         self.color_index += 1
 
-        method = self.alloc_method.get()
-
-        def find_fit():
-            best_start = -1
-            best_size = 101
-            current_start = -1
-            current_len = 0
-            for i in range(100):
-                if self.memory_blocks[i] is None:
-                    if current_start == -1:
-                        current_start = i
-                    current_len += 1
-                else:
-                    if method == "First-Fit" and current_len >= size:
-                        return current_start
-                    if method == "Best-Fit" and current_len >= size and current_len < best_size:
-                        best_start = current_start
-                        best_size = current_len
-                    current_start = -1
-                    current_len = 0
-            if method == "First-Fit" and current_len >= size:
-                return current_start
-            if method == "Best-Fit" and current_len >= size and current_len < best_size:
-                return best_start if best_start != -1 else current_start
-            return -1
-
-        start = find_fit()
-        if start == -1:
+        try:
+            start = self.memory.allocate(size, method, pid=pid, color=color)
+        except ValueError as e:
+            messagebox.showerror("Invalid Input", str(e))
+            return
+        if start is None:
             messagebox.showwarning("Allocation Failed", "No suitable space available.")
             return
 
-        for i in range(start, start + size):
-            self.memory_blocks[i] = (pid, color)
-        
-        self.memory_allocations.append({
-            "pid": pid,
-            "start": start,
-            "size": size,
-            "color": color,
-            "status": "Allocated"
-        })
-        
-        self.mem_log_table.insert("", tk.END, values=(pid, start, size, "Allocated"))
+        self.mem_log_table.insert("", tk.END, values=(pid, start, self.memory.processes[pid]["size"], "Allocated"))
         self.refresh_memory_blocks()
         self.mem_pid.delete(0, tk.END)
         self.mem_size.delete(0, tk.END)
@@ -845,31 +879,15 @@ class MiniOS:
             messagebox.showerror("Invalid PID", "Please select a valid process ID.")
             return
 
-        # Find all allocations for this PID
-        allocations_to_remove = []
-        blocks_freed = 0
-
-        # First pass: Identify allocations to remove and free blocks
-        for i, block in enumerate(self.memory_blocks):
-            if block is not None and block[0] == pid:
-                self.memory_blocks[i] = None  # Free the block
-                blocks_freed += 1
-
-        # Second pass: Update allocations list and table
-        updated_allocations = []
-        for alloc in self.memory_allocations:
-            if alloc["pid"] == pid:
-                # Update table entry if found
-                for item in self.mem_log_table.get_children():
-                    values = self.mem_log_table.item(item)["values"]
-                    if values[0] == pid and values[3] == "Allocated":
-                        self.mem_log_table.delete(item)
-                        break
-            else:
-                updated_allocations.append(alloc)
-        self.memory_allocations = updated_allocations
+        blocks_freed = self.memory.release(pid)
+        for item in self.mem_log_table.get_children():
+            values = self.mem_log_table.item(item)["values"]
+            if values[0] == pid and values[3] == "Allocated":
+                self.mem_log_table.delete(item)
+                break
 
         # Update UI
+        self.dealloc_pid.set("")
         self.refresh_memory_blocks()
         
         if blocks_freed > 0:
@@ -880,15 +898,10 @@ class MiniOS:
                                 f"No allocated memory found for Process P{pid}")
             
     def compact_memory(self):
-        allocated = [block for block in self.memory_blocks if block is not None]
-        self.memory_blocks = [None] * 100
-        for i, block in enumerate(allocated):
-            self.memory_blocks[i] = block
-        for alloc in self.memory_allocations:
-            if alloc["status"] == "Allocated":
-                alloc["start"] = self.memory_blocks.index((alloc['pid'], alloc['color']))
+        result = self.memory.compact_memory()
+        self.refresh_memory_table()
         self.refresh_memory_blocks()
-        messagebox.showinfo("Success", "Memory compaction completed")
+        messagebox.showinfo("Success", result)
 
 
     # File Management Tab
@@ -968,6 +981,13 @@ class MiniOS:
         title.pack(pady=(0, 10), fill=tk.X)
 
         self.scheduler = ProcessScheduler()
+        self.policy_names = {
+            "Shortest Job First (SJF)": "SJF",
+            "Shortest Remaining Time First (SRTF)": "SRTF",
+            "Priority (Non-Preemptive)": "Priority",
+            "Priority (Preemptive)": "Priority-P",
+            "Multi-Level Feedback Queue (MLFQ)": "MLFQ",
+        }
         self.current_running = None
         self.running = False
         self.time_quantum = 100
@@ -989,7 +1009,7 @@ class MiniOS:
 
         # Algorithm selector
         tk.Label(controls, text="Select Algorithm:", font=self.font_secondary, bg=self.bg_color).grid(row=2, column=0, padx=5, pady=2)
-        self.algorithm = ttk.Combobox(controls, values=["First-Come, First-Served (FCFS)", "Round Robin"], state="readonly")
+        self.algorithm = ttk.Combobox(controls, values=["First-Come, First-Served (FCFS)", "Round Robin"] + list(self.policy_names), state="readonly")
         self.algorithm.current(0)
         self.algorithm.grid(row=2, column=1, padx=5)
 
@@ -999,6 +1019,18 @@ class MiniOS:
         self.quantum_entry.insert(0, "100")
         self.quantum_entry.grid(row=3, column=1, padx=5)
 
+        # Priority (lower runs first)
+        tk.Label(controls, text="Priority:", font=self.font_secondary, bg=self.bg_color).grid(row=4, column=0, padx=5, pady=2)
+        self.proc_priority = ttk.Entry(controls)
+        self.proc_priority.insert(0, "0")
+        self.proc_priority.grid(row=4, column=1, padx=5)
+
+        # Context-switch overhead, paid whenever the CPU changes process
+        tk.Label(controls, text="Switch cost (ms):", font=self.font_secondary, bg=self.bg_color).grid(row=5, column=0, padx=5, pady=2)
+        self.switch_cost_entry = ttk.Entry(controls)
+        self.switch_cost_entry.insert(0, "0")
+        self.switch_cost_entry.grid(row=5, column=1, padx=5)
+
         # Buttons
         ttk.Button(controls, text="Add Process", command=self.add_process).grid(row=0, column=2, padx=10)
         ttk.Button(controls, text="Run Scheduler", command=self.run_scheduler).grid(row=1, column=2, padx=10)
@@ -1033,12 +1065,17 @@ class MiniOS:
         result_frame = tk.LabelFrame(container, text="Process Results", font=self.font_secondary, bg=self.bg_color, fg=self.text_color)
         result_frame.pack(fill=tk.BOTH, expand=True)
 
-        self.result_table = ttk.Treeview(result_frame, columns=("pid", "name", "burst", "arrival", "completion", "waiting", "turnaround"), show="headings")
-        for col in ["pid", "name", "burst", "arrival", "completion", "waiting", "turnaround"]:
+        self.result_table = ttk.Treeview(result_frame, columns=("pid", "name", "burst", "arrival", "completion", "waiting", "turnaround", "switches"), show="headings")
+        for col in ["pid", "name", "burst", "arrival", "completion", "waiting", "turnaround", "switches"]:
             self.result_table.heading(col, text=col.capitalize())
             self.result_table.column(col, anchor="center", width=80)
         self.result_table.pack(fill=tk.BOTH, expand=True)
 
+        # Running statistics, updated as each process completes
+        self.metrics = SchedulingMetrics()
+        self.metrics_label = tk.Label(result_frame, text="No processes completed.", bg=self.bg_color, font=self.font_secondary, anchor="w")
+        self.metrics_label.pack(fill=tk.X)
+
         # Process Data Store
         self.proc_list = []
         self.gantt_time = 0
@@ -1056,15 +1093,23 @@ class MiniOS:
             messagebox.showerror("Error", "Please enter a valid name and burst time")
             return
 
+        try:
+            priority = int(self.proc_priority.get() or 0)
+        except ValueError:
+            messagebox.showerror("Error", "Priority must be an integer")
+            return
+
         process = {
             "pid": self.pid_counter,
             "name": name,
             "burst": burst,
             "arrival": self.gantt_time,
             "remaining": burst,
+            "priority": priority,
             "completion": None,
             "waiting": 0,
             "turnaround": 0,
+            "switches": 0,
             "status": "Ready"
         }
         self.proc_list.append(process)
@@ -1083,6 +1128,11 @@ class MiniOS:
             quantum = int(self.quantum_entry.get())
         except ValueError:
             quantum = 100
+        try:
+            self.switch_cost = max(0, int(self.switch_cost_entry.get()))
+        except ValueError:
+            self.switch_cost = 0
+        self.last_pid = None
             
         # Reset state when starting scheduler
         self.clear_gantt_chart()
@@ -1090,6 +1140,8 @@ class MiniOS:
         self.running = True
         if algo == "First-Come, First-Served (FCFS)":
             self.schedule_fcfs()
+        elif algo in self.policy_names:
+            self.schedule_policy(self.policy_names[algo], quantum)
         else:
             self.schedule_rr(quantum)
 
@@ -1149,6 +1201,17 @@ class MiniOS:
         if "color" not in process:
             process["color"] = f"#{random.randint(100, 255):02x}{random.randint(100, 255):02x}{random.randint(100, 255):02x}"
 
+        # Switching from another process costs switch_cost before the slice
+        switch_time = 0
+        if self.last_pid is not None and self.last_pid != process["pid"]:
+            process["switches"] += 1
+            switch_time = self.switch_cost
+        if switch_time:
+            self.draw_switch(self.gantt_time, switch_time)
+            self.gantt_blocks.append({"pid": None, "slice_time": switch_time, "color": "gray"})
+            self.gantt_time += switch_time
+        self.last_pid = process["pid"]
+
         # Add block to Gantt chart
         x_start = sum(block["slice_time"] for block in self.gantt_blocks)
         x_end = x_start + slice_time
@@ -1183,7 +1246,7 @@ class MiniOS:
                 process["completion"] = self.gantt_time
                 process["turnaround"] = process["completion"] - process["arrival"]
                 process["waiting"] = process["turnaround"] - process["burst"]
-                self.refresh_results()
+                self.add_result(process)
             else:
                 # Move the process to the end of the ready queue
                 process["status"] = "Ready"
@@ -1194,8 +1257,85 @@ class MiniOS:
             if self.running:
                 self.schedule_rr(quantum)
 
-        # Schedule the next step after the current slice
-        self.root.after(slice_time, next_step)
+        # Schedule the next step after the switch and the current slice
+        self.root.after(switch_time + slice_time, next_step)
+
+    def schedule_policy(self, policy, quantum):
+        """Simulate the ready processes under `policy`, then replay the slices"""
+        ready = [p for p in self.proc_list if p["status"] == "Ready"]
+        if not ready:
+            return
+
+        self.scheduler = ProcessScheduler(context_switch_cost=self.switch_cost)
+        self.scheduler.quantum = quantum
+        self.scheduler.current_time = self.gantt_time
+        self.scheduler.set_policy(policy)
+        by_pid = {}
+        for p in ready:
+            self.scheduler.add_process(p["name"], p["remaining"], p["priority"])
+            by_pid[self.scheduler.current_pid - 1] = p
+        timeline = self.scheduler.run_to_completion()
+        for pid, p in by_pid.items():
+            p["switches"] += self.scheduler.get_process_details(pid)["context_switches"]
+        self.play_timeline(timeline, by_pid, 0)
+
+    def play_timeline(self, timeline, by_pid, index):
+        """Draw one simulated slice on the Gantt chart and schedule the next"""
+        if not self.running or index >= len(timeline):
+            if self.running:
+                self.running_label.config(text="All processes completed!")
+            return
+
+        entry = timeline[index]
+        process = by_pid[entry["pid"]]
+        process["status"] = "Running"
+        self.update_ready_queue()
+        self.running_label.config(
+            text=f"Running: P{process['pid']} ({process['name']}) | Slice: {entry['duration']}ms | Remaining: {process['remaining']}ms"
+        )
+
+        if "color" not in process:
+            process["color"] = f"#{random.randint(100, 255):02x}{random.randint(100, 255):02x}{random.randint(100, 255):02x}"
+
+        # A gap before the slice is dispatch overhead
+        switch_time = entry["start"] - self.gantt_time
+        if switch_time > 0:
+            self.draw_switch(self.gantt_time, switch_time)
+            self.gantt_blocks.append({"pid": None, "slice_time": switch_time, "color": "gray"})
+            self.gantt_time += switch_time
+
+        x_start = self.gantt_time
+        self.gantt_canvas.create_rectangle(
+            x_start, 0, x_start + entry["duration"], 50,
+            fill=process["color"], outline="black"
+        )
+        self.gantt_canvas.create_text(
+            x_start + entry["duration"] // 2, 25,
+            text=f"P{process['pid']}", font=("Arial", 8)
+        )
+        self.gantt_canvas.config(scrollregion=(0, 0, x_start + entry["duration"] + 100, 50))
+        self.gantt_blocks.append({"pid": process["pid"], "slice_time": entry["duration"], "color": process["color"]})
+
+        process["remaining"] -= entry["duration"]
+        self.gantt_time += entry["duration"]
+
+        def next_step():
+            if process["remaining"] <= 0:
+                process["status"] = "Completed"
+                process["completion"] = self.gantt_time
+                process["turnaround"] = process["completion"] - process["arrival"]
+                process["waiting"] = process["turnaround"] - process["burst"]
+                self.add_result(process)
+            else:
+                process["status"] = "Ready"
+            self.play_timeline(timeline, by_pid, index + 1)
+
+        self.root.after(max(0, switch_time) + entry["duration"], next_step)
+
+    def draw_switch(self, x_start, width):
+        """Draw a context-switch block on the Gantt chart"""
+        self.gantt_canvas.create_rectangle(x_start, 0, x_start + width, 50, fill="gray", outline="black")
+        self.gantt_canvas.create_text(x_start + width // 2, 25, text="CS", font=("Arial", 8))
 
     def finish_process(self, process):
         process["status"] = "Completed"
@@ -1204,20 +1344,32 @@ class MiniOS:
         process["waiting"] = process["turnaround"] - process["burst"]
         self.running_label.config(text="All processes completed!")
         self.update_ready_queue()
-        self.refresh_results()
+        self.add_result(process)
         if self.algorithm.get() == "First-Come, First-Served (FCFS)" and self.running:
             self.schedule_fcfs()
 
-    def refresh_results(self):
-        for item in self.result_table.get_children():
-            self.result_table.delete(item)
-        for p in self.proc_list:
-            if p["status"] in ["Completed"]:
-                self.result_table.insert("", tk.END, values=(
-                    p["pid"], p["name"], p["burst"], p["arrival"],
-                    p["completion"], p["waiting"], p["turnaround"]
-                ))
-    
+    def add_result(self, process):
+        """Append one completed process to the results table"""
+        self.result_table.insert("", tk.END, values=(
+            process["pid"], process["name"], process["burst"], process["arrival"],
+            process["completion"], process["waiting"], process["turnaround"], process["switches"]
+        ))
+        self.metrics.record_completion(process["arrival"], process["burst"], process["completion"])
+        self.metrics.record_slice(process["burst"])
+        self.update_metrics()
+
+    def update_metrics(self):
+        """Show the running waiting/turnaround statistics below the results"""
+        stats = self.metrics.summary()
+        if not stats["completed"]:
+            self.metrics_label.config(text="No processes completed.")
+            return
+        self.metrics_label.config(text=(
+            f"Waiting avg {stats['avg_waiting']:.1f} / p95 {stats['p95_waiting']:.0f}ms | "
+            f"Turnaround avg {stats['avg_turnaround']:.1f} / p95 {stats['p95_turnaround']:.0f}ms | "
+            f"CPU {stats['utilization']:.0%} | Fairness {stats['fairness']:.2f}"
+        ))
+
     def clear_gantt_chart(self):
         self.gantt_canvas.delete("all")
         self.gantt_blocks = []
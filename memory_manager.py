@@ -1,148 +1,580 @@
 # memory_manager.py
+from array import array
 from datetime import datetime
 import random
+from time import perf_counter_ns
 
-# Constants
-BLOCK_SIZE = 1
+from buddy import BuddyAllocator
+from extents import ExtentTree, FreeExtents
+from slab import SIZE_CLASSES, SLAB_BLOCKS, SlabAllocator
+
+# Defaults
+BLOCK_SIZE = 1  # KB per block
 TOTAL_BLOCKS = 100
 TOTAL_MEMORY = BLOCK_SIZE * TOTAL_BLOCKS
+MAX_BLOCKS = 1 << 30
+BLOCK_MAP_LIMIT = 1 << 24  # Largest arena that gets a per-block map by default
 
-# State
-memory = [None] * TOTAL_BLOCKS  # Each block = None or (PID, color)
-processes = {}  # PID: {name, start, size, color, status, alloc_time}
-next_pid = 1
+# Free-space structure behind each allocator, and the methods each one offers
+ALLOCATORS = {'extent': FreeExtents, 'buddy': BuddyAllocator}
+METHODS = {'First-Fit': 'extent', 'Best-Fit': 'extent', 'Next-Fit': 'extent', 'Worst-Fit': 'extent',
+           'Buddy': 'buddy', 'Slab': 'extent'}
+NO_OWNER = -2**31  # BlockMap owner of slab slots nobody holds
+COMPACT_SCAN = 4096  # Allocations a bounded compact_step() inspects at most
+LATENCY_BUCKETS = 48  # Power-of-two ns buckets, up to about 39 hours
 
 def generate_color():
     # Generate a distinct color
     return "#{:06x}".format(random.randint(0x111111, 0xEEEEEE))
 
-def first_fit(process_name, size_kb):
-    global next_pid
-    blocks_needed = size_kb
-    free_count = 0
-    start_index = 0
-
-    for i in range(TOTAL_BLOCKS):
-        if memory[i] is None:
-            if free_count == 0:
-                start_index = i
-            free_count += 1
-            if free_count == blocks_needed:
-                color = generate_color()
-                for j in range(start_index, start_index + blocks_needed):
-                    memory[j] = (next_pid, color)
-                processes[next_pid] = {
-                    'name': process_name,
-                    'start': start_index,
-                    'size': blocks_needed,
-                    'color': color,
-                    'status': 'Ready',
-                    'alloc_time': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                }
-                result = f"Allocated {blocks_needed}KB to '{process_name}' (PID: {next_pid}) using First-Fit."
-                next_pid += 1
-                return result
+
+class BlockMap:
+    """Per-block view of an arena: a used bytearray and int32 owner PIDs, 5 bytes per block"""
+
+    def __init__(self, total_blocks):
+        self.used = bytearray(total_blocks)
+        self.owners = array('i', bytes(4 * total_blocks))
+
+    def fill(self, start, size, pid):
+        self.used[start:start + size] = b'\x01' * size
+        self.owners[start:start + size] = array('i', [pid]) * size
+
+    def clear(self, start, size):
+        self.used[start:start + size] = bytes(size)
+
+    def move(self, old, new, size):
+        """Copy the run at `old` to `new` (which may overlap it) and free what it leaves behind"""
+        self.used[new:new + size] = self.used[old:old + size]
+        self.owners[new:new + size] = self.owners[old:old + size]
+        if new < old:
+            vacated = max(old, new + size)
+            self.clear(vacated, old + size - vacated)
         else:
-            free_count = 0
+            self.clear(old, min(new, old + size) - old)
 
-    return f"Not enough contiguous memory for process '{process_name}' (needed: {blocks_needed} blocks)."
+    def owner_of(self, block):
+        pid = self.owners[block]
+        return pid if self.used[block] and pid != NO_OWNER else None
 
-def best_fit(process_name, size_kb):
-    global next_pid
-    blocks_needed = size_kb
-    best_start = -1
-    best_size = float('inf')
-    current_start = -1
-    current_size = 0
-
-    for i in range(TOTAL_BLOCKS + 1):
-        if i < TOTAL_BLOCKS and memory[i] is None:
-            if current_start == -1:
-                current_start = i
-            current_size += 1
+    def nbytes(self):
+        return len(self.used) + self.owners.itemsize * len(self.owners)
+
+
+class LatencyHistogram:
+    """Operation latencies counted in power-of-two nanosecond buckets"""
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.buckets = array('q', [0]) * LATENCY_BUCKETS
+        self.count = 0
+        self.total_ns = 0
+
+    def add(self, ns):
+        self.buckets[min(ns.bit_length(), LATENCY_BUCKETS - 1)] += 1
+        self.count += 1
+        self.total_ns += ns
+
+    def percentile(self, q):
+        """Upper bound (ns) of the bucket holding the q-quantile"""
+        rank = q * self.count
+        seen = 0
+        for k, bucket in enumerate(self.buckets):
+            seen += bucket
+            if bucket and seen >= rank:
+                return 1 << k
+        return 0
+
+    def summary(self):
+        return {
+            'count': self.count,
+            'mean_ns': self.total_ns / self.count if self.count else 0.0,
+            'p50_ns': self.percentile(0.5),
+            'p99_ns': self.percentile(0.99),
+            'buckets': {1 << k: bucket for k, bucket in enumerate(self.buckets) if bucket},
+        }
+
+
+class MemoryManager:
+    """Contiguous allocation over an arena of equal-size blocks, tracked as extents"""
+
+    def __init__(self, total_blocks=TOTAL_BLOCKS, block_size=BLOCK_SIZE, block_map=None,
+                 allocator='extent', size_classes=SIZE_CLASSES, slab_blocks=SLAB_BLOCKS):
+        if not 1 <= total_blocks <= MAX_BLOCKS:
+            raise ValueError(f"Arena size must be between 1 and {MAX_BLOCKS} blocks.")
+        if block_size <= 0:
+            raise ValueError("Block size must be positive.")
+        if allocator not in ALLOCATORS:
+            raise ValueError(f"Allocator must be one of {', '.join(ALLOCATORS)}.")
+        self.total_blocks = total_blocks
+        self.block_size = block_size
+        if block_map is None:
+            block_map = total_blocks <= BLOCK_MAP_LIMIT
+        self.use_block_map = block_map
+        self.allocator = allocator
+        self.free_space = ALLOCATORS[allocator](total_blocks)
+        self.slabs = SlabAllocator(size_classes, slab_blocks)
+        self.version = 0  # Bumped on every change to the layout
+        self.reset()
+
+    @property
+    def total_memory(self):
+        return self.total_blocks * self.block_size
+
+    def reset(self):
+        self.processes = {}  # PID: {name, start, size, color, status, alloc_time}
+        self.allocated = ExtentTree()  # Start: size of every allocation and slab
+        self.owners = {}  # Start: PID of every allocation outside a slab
+        self.next_pid = 1
+        self.requested_blocks = 0  # Blocks asked for; allocations may round up
+        self.rover = 0  # Where the last Next-Fit search ended
+        self.compact_cursor = 0  # Where the next compact_step() starts
+        self.compact_pass_moved = 0  # Allocations moved so far in the current pass
+        self.compact_version = None  # Layout version when the last pass found nothing left to do
+        self.run_tree = ExtentTree()  # (start, PID): length of every allocation, slab objects included
+        self.version += 1
+        self.state_cache = None  # (version, get_memory_state() result)
+        self.successes = dict.fromkeys(METHODS, 0)
+        self.failures = dict.fromkeys(METHODS, 0)
+        self.frees = 0
+        self.latency = {op: LatencyHistogram() for op in (*METHODS, 'Free')}
+        self.free_space.clear()
+        self.slabs.clear()
+        self.block_map = BlockMap(self.total_blocks) if self.use_block_map else None
+        return "Memory has been completely reset."
+
+    def blocks_for(self, size_kb):
+        """Whole blocks needed to hold `size_kb` KB"""
+        return -(-size_kb // self.block_size)
+
+    def allocate(self, size, method='First-Fit', name=None, pid=None, color=None):
+        """Place `size` blocks for a new process; return the start block, or None if nothing fits"""
+        if method not in METHODS:
+            raise ValueError(f"Unknown allocation method '{method}'.")
+        if METHODS[method] != self.allocator:
+            raise ValueError(f"{method} needs an arena with the '{METHODS[method]}' allocator.")
+        if size <= 0:
+            raise ValueError("Size must be a positive number of blocks.")
+        if pid is None:
+            pid = self.next_pid
+        elif pid in self.processes:
+            raise ValueError(f"P{pid} is already allocated.")
+        elif not NO_OWNER < pid < 2**31:
+            raise ValueError("PIDs must fit in 32 bits.")
+
+        began = perf_counter_ns()
+        requested = size
+        size_class = self.slabs.size_class(size) if method == 'Slab' else None
+        if size_class is not None:
+            size = size_class
+            start = self.slabs.allocate(size_class, pid)
+            if start is None and self.add_slab(size_class):
+                start = self.slabs.allocate(size_class, pid)
+            if start is None:
+                self.record(method, began, False)
+                return None
         else:
-            if current_size >= blocks_needed and current_size < best_size:
-                best_start = current_start
-                best_size = current_size
-            current_start = -1
-            current_size = 0
-
-    if best_start != -1:
-        color = generate_color()
-        for j in range(best_start, best_start + blocks_needed):
-            memory[j] = (next_pid, color)
-        processes[next_pid] = {
-            'name': process_name,
-            'start': best_start,
-            'size': blocks_needed,
-            'color': color,
+            if method == 'Best-Fit':
+                start = self.free_space.best_fit(size)
+            elif method == 'Next-Fit':
+                start = self.free_space.next_fit(size, self.rover)
+            elif method == 'Worst-Fit':
+                start = self.free_space.worst_fit(size)
+            elif method == 'Buddy':
+                size = self.free_space.block_size(size)
+                start = self.free_space.buddy_fit(size)
+            else:
+                # First-Fit, and Slab requests too big for any size class
+                start = self.free_space.first_fit(size)
+            if start is None:
+                self.record(method, began, False)
+                return None
+            if method == 'Next-Fit':
+                self.rover = start + size
+            self.free_space.allocate(start, size)
+            self.allocated.insert(start, size)
+            self.owners[start] = pid
+
+        self.requested_blocks += requested
+        self.add_run(start, size, pid)
+        if self.block_map:
+            self.block_map.fill(start, size, pid)
+        self.processes[pid] = {
+            'name': name if name is not None else f"P{pid}",
+            'start': start,
+            'size': size,
+            'requested': requested,
+            'slab': size_class is not None,
+            'color': color or generate_color(),
             'status': 'Ready',
             'alloc_time': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         }
-        result = f"Allocated {blocks_needed}KB to '{process_name}' (PID: {next_pid}) using Best-Fit."
-        next_pid += 1
-        return result
+        self.next_pid = max(self.next_pid, pid + 1)
+        self.record(method, began, True)
+        return start
+
+    def record(self, method, began, succeeded):
+        """Count an allocation attempt that started at perf_counter_ns() `began`"""
+        self.latency[method].add(perf_counter_ns() - began)
+        if succeeded:
+            self.successes[method] += 1
+        else:
+            self.failures[method] += 1
+
+    def allocate_kb(self, process_name, size_kb, method):
+        blocks_needed = self.blocks_for(size_kb)
+        pid = self.next_pid
+        try:
+            start = self.allocate(blocks_needed, method, process_name) if blocks_needed > 0 else None
+        except ValueError as e:
+            return str(e)
+        if start is None:
+            return f"Not enough contiguous memory for process '{process_name}' (needed: {blocks_needed} blocks)."
+        granted = self.processes[pid]['size']
+        return f"Allocated {granted * self.block_size}KB to '{process_name}' (PID: {pid}) using {method}."
+
+    def first_fit(self, process_name, size_kb):
+        return self.allocate_kb(process_name, size_kb, 'First-Fit')
+
+    def best_fit(self, process_name, size_kb):
+        return self.allocate_kb(process_name, size_kb, 'Best-Fit')
+
+    def next_fit(self, process_name, size_kb):
+        return self.allocate_kb(process_name, size_kb, 'Next-Fit')
+
+    def worst_fit(self, process_name, size_kb):
+        return self.allocate_kb(process_name, size_kb, 'Worst-Fit')
+
+    def buddy(self, process_name, size_kb):
+        return self.allocate_kb(process_name, size_kb, 'Buddy')
+
+    def slab(self, process_name, size_kb):
+        return self.allocate_kb(process_name, size_kb, 'Slab')
+
+    def add_run(self, start, length, pid):
+        self.run_tree.insert((start, pid), length)
+        self.version += 1
+
+    def remove_run(self, start, pid):
+        self.run_tree.remove((start, pid))
+        self.version += 1
+
+    def add_slab(self, size_class):
+        """Carve a new slab for `size_class` out of the arena; return False if there is no room"""
+        slab_blocks = self.slabs.slab_blocks
+        start = self.free_space.first_fit(slab_blocks)
+        if start is None:
+            return False
+        self.free_space.allocate(start, slab_blocks)
+        self.allocated.insert(start, slab_blocks)
+        if self.block_map:
+            self.block_map.fill(start, slab_blocks, NO_OWNER)
+        self.slabs.add_slab(start, size_class)
+        self.version += 1
+        return True
+
+    def release_extent(self, start, size):
+        self.allocated.remove(start)
+        self.free_space.free(start, size)
+        self.version += 1
+        if self.block_map:
+            self.block_map.clear(start, size)
+
+    def release(self, pid):
+        """Free the blocks of `pid`; return how many were freed (0 if it had none)"""
+        began = perf_counter_ns()
+        proc = self.processes.pop(pid, None)
+        if proc is None:
+            return 0
+        start, size = proc['start'], proc['size']
+        self.requested_blocks -= proc['requested']
+        self.remove_run(start, pid)
+        if proc['slab']:
+            if self.block_map:
+                self.block_map.fill(start, size, NO_OWNER)
+            empty_slab = self.slabs.free(start)
+            if empty_slab is not None:
+                self.release_extent(empty_slab, self.slabs.slab_blocks)
+        else:
+            del self.owners[start]
+            self.release_extent(start, size)
+        self.frees += 1
+        self.latency['Free'].add(perf_counter_ns() - began)
+        return size
+
+    def free(self, process_id):
+        try:
+            pid = int(process_id)
+            if pid not in self.processes:
+                return f"No process with PID {pid} found."
+
+            name = self.processes[pid]['name']
+            size = self.release(pid)
+            return f"Freed {size * self.block_size}KB from process '{name}' (PID: {pid})."
+        except ValueError:
+            return "Invalid Process ID."
+
+    def lowest_fit(self, size):
+        """Lowest start at which the free space can place `size` blocks, or None"""
+        if self.allocator == 'buddy':
+            return self.free_space.lowest_fit(size)
+        return self.free_space.first_fit(size)
+
+    def extent_size(self, start):
+        """Blocks in the allocation or slab at `start`"""
+        pid = self.owners.get(start)
+        return self.slabs.slab_blocks if pid is None else self.processes[pid]['size']
+
+    def move_extent(self, start, new_start, size):
+        """Move the allocation or slab at `start`, already back in the free space, to `new_start`"""
+        self.allocated.remove(start)
+        self.allocated.insert(new_start, size)
+        self.free_space.allocate(new_start, size)
+        if self.block_map:
+            self.block_map.move(start, new_start, size)
+        pid = self.owners.pop(start, None)
+        if pid is not None:
+            self.owners[new_start] = pid
+            self.processes[pid]['start'] = new_start
+            self.remove_run(start, pid)
+            self.add_run(new_start, size, pid)
+        else:
+            for old, new in self.slabs.relocate({start: new_start}).items():
+                pid = self.owner_of(new)
+                proc = self.processes[pid]
+                proc['start'] = new
+                self.remove_run(old, pid)
+                self.add_run(new, proc['size'], pid)
+
+    def can_move_down(self, start, size):
+        """Whether the allocation at `start` may fit lower once freed, checked without freeing it"""
+        fit = self.lowest_fit(size)
+        if fit is not None and fit < start:
+            return True
+        below = self.allocated.floor(start - 1)
+        return start > 0 and (below is None or below + self.extent_size(below) < start)
+
+    def compact_step(self, max_blocks=None):
+        """Move allocations down to the lowest free run that holds them, about `max_blocks` blocks per step"""
+        # A step's first move may exceed max_blocks, so large allocations still move; a bounded
+        # step also inspects at most COMPACT_SCAN allocations. Done once a pass leaves the
+        # arena packed or moves nothing, and no new pass starts until the layout changes.
+        if max_blocks is not None and max_blocks < 1:
+            raise ValueError("max_blocks must be at least 1.")
+        moved_extents = moved_blocks = 0
+        cursor = self.compact_cursor
+        done = cursor == 0 and self.compact_version == self.version
+        scan = None if max_blocks is None else COMPACT_SCAN
+        while not done:
+            if scan is not None:
+                if not scan:
+                    break
+                scan -= 1
+            start = self.allocated.ceiling(cursor)
+            if start is None:
+                last = self.allocated.floor(self.total_blocks)
+                self.rover = 0 if last is None else last + self.extent_size(last)
+                packed = self.rover == self.total_blocks - self.free_space.free_blocks
+                cursor = 0
+                if packed or not self.compact_pass_moved:
+                    done = True
+                    self.compact_version = self.version
+                self.compact_pass_moved = 0
+                continue
+
+            size = self.extent_size(start)
+            if not self.can_move_down(start, size):
+                cursor = start + size
+                continue
+            self.free_space.free(start, size)
+            new_start = self.lowest_fit(size)
+            if new_start is None or new_start >= start:
+                self.free_space.allocate(start, size)
+                cursor = start + size
+                continue
+            if max_blocks is not None and moved_blocks and moved_blocks + size > max_blocks:
+                self.free_space.allocate(start, size)
+                cursor = start
+                break
+            self.move_extent(start, new_start, size)
+            moved_extents += 1
+            moved_blocks += size
+            self.compact_pass_moved += 1
+            cursor = start + size
+
+        self.compact_cursor = cursor
+        return {
+            'moved_extents': moved_extents,
+            'moved_blocks': moved_blocks,
+            'moved_bytes': moved_blocks * self.block_size * 1024,
+            'done': done,
+        }
+
+    def compact_memory(self):
+        """Slide every allocation as far down the arena as it goes"""
+        self.compact_cursor = 0
+        self.compact_pass_moved = 0
+        result = self.compact_step()
+        return (f"Memory compaction completed: moved {result['moved_blocks'] * self.block_size}KB "
+                f"in {result['moved_extents']} allocations.")
+
+    def owner_of(self, block):
+        """PID holding `block`, or None if it is free"""
+        if self.block_map:
+            return self.block_map.owner_of(block)
+        start = self.allocated.floor(block)
+        if start is None:
+            return None
+        slab = self.slabs.slabs.get(start)
+        if slab is not None:
+            return slab.owner_at(block) if block < start + self.slabs.slab_blocks else None
+        if block >= start + self.processes[self.owners[start]]['size']:
+            return None
+        return self.owners[start]
+
+    def block_owners(self, start=0, end=None):
+        """PID or None for each block in [start, end)"""
+        end = self.total_blocks if end is None else min(end, self.total_blocks)
+        if self.block_map:
+            used = self.block_map.used
+            return [pid if used[start + i] and pid != NO_OWNER else None
+                    for i, pid in enumerate(self.block_map.owners[start:end])]
+        owners = [None] * (end - start)
+        first = self.allocated.floor(start)
+        for alloc_start, size in self.allocated.iter_from(start if first is None else first):
+            if alloc_start >= end:
+                break
+            slab = self.slabs.slabs.get(alloc_start)
+            if slab is None:
+                pieces = [(alloc_start, size, self.owners[alloc_start])]
+            else:
+                pieces = [(alloc_start + slot * slab.size_class, slab.size_class, pid)
+                          for slot, pid in enumerate(slab.slot_owners) if pid is not None]
+            for piece_start, piece_size, pid in pieces:
+                lo, hi = max(piece_start, start), min(piece_start + piece_size, end)
+                if lo < hi:
+                    owners[lo - start:hi - start] = [pid] * (hi - lo)
+        return owners
+
+    def holes(self):
+        """Number of free runs and the length of the longest, with adjacent buddy blocks joined"""
+        if self.allocator == 'extent':
+            return len(self.free_space), self.free_space.largest()
+        lengths = [length for _, length in self.free_space]
+        return len(lengths), max(lengths, default=0)
+
+    def fragmentation(self):
+        """Internal (rounding) and external (free space outside the longest free run) fragmentation"""
+        free = self.free_space.free_blocks
+        allocated = self.total_blocks - free
+        internal = allocated - self.requested_blocks
+        largest = self.holes()[1]
+        return {
+            'allocated_blocks': allocated,
+            'requested_blocks': self.requested_blocks,
+            'internal_blocks': internal,
+            'internal': internal / allocated if allocated else 0.0,
+            'free_blocks': free,
+            'largest_free': largest,
+            'largest_block': self.free_space.largest(),  # Largest request that fits now
+            'external': 1 - largest / free if free else 0.0,
+        }
 
-    return f"Not enough contiguous memory for process '{process_name}' (needed: {blocks_needed} blocks)."
+    def stats(self):
+        """Free space, fragmentation, operation counts and latency histograms in one call"""
+        free = self.free_space.free_blocks
+        holes, largest = self.holes()
+        allocations = sum(self.successes.values())
+        failures = sum(self.failures.values())
+        return {
+            'free_blocks': free,
+            'largest_free': largest,
+            'largest_block': self.free_space.largest(),
+            'free_holes': holes,
+            'external': 1 - largest / free if free else 0.0,
+            'allocations': allocations,
+            'failures': failures,
+            'frees': self.frees,
+            'methods': {method: {'allocations': self.successes[method], 'failures': self.failures[method]}
+                        for method, allocator in METHODS.items() if allocator == self.allocator},
+            'latency': {op: histogram.summary() for op, histogram in self.latency.items() if histogram.count},
+        }
+
+    def slab_stats(self):
+        """Slab count and slot utilization, overall and per size class"""
+        return self.slabs.stats()
+
+    def get_memory_blocks(self):
+        """Returns a list of (PID, color) or None for each block"""
+        colors = {pid: (pid, proc['color']) for pid, proc in self.processes.items()}
+        return [None if pid is None else colors[pid] for pid in self.block_owners()]
+
+    def runs(self):
+        """Yield (start, length, PID) of every allocation in address order"""
+        for (start, pid), length in self.run_tree:
+            yield start, length, pid
+
+    def get_memory_state(self):
+        """Allocation runs and process table in address order, cached until the layout version changes"""
+        if self.state_cache is not None and self.state_cache[0] == self.version:
+            return self.state_cache[1]
+        process_table = []
+        for start, length, pid in self.runs():
+            info = self.processes[pid]
+            process_table.append({
+                'PID': pid,
+                'Name': info['name'],
+                'Start': start,
+                'Size': length,
+                'Status': info['status'],
+                'Allocated': info['alloc_time']
+            })
+        state = {
+            'version': self.version,
+            'runs': tuple(self.runs()),
+            'process_table': process_table,
+        }
+        self.state_cache = (self.version, state)
+        return state
+
+
+# Default arena behind the module-level functions
+manager = MemoryManager()
+
+def first_fit(process_name, size_kb):
+    return manager.first_fit(process_name, size_kb)
+
+def best_fit(process_name, size_kb):
+    return manager.best_fit(process_name, size_kb)
+
+def next_fit(process_name, size_kb):
+    return manager.next_fit(process_name, size_kb)
+
+def worst_fit(process_name, size_kb):
+    return manager.worst_fit(process_name, size_kb)
+
+def slab(process_name, size_kb):
+    return manager.slab(process_name, size_kb)
 
 def free(process_id):
-    try:
-        pid = int(process_id)
-        if pid not in processes:
-            return f"No process with PID {pid} found."
-
-        start = processes[pid]['start']
-        size = processes[pid]['size']
-        for i in range(start, start + size):
-            if memory[i] and memory[i][0] == pid:
-                memory[i] = None
-
-        name = processes[pid]['name']
-        del processes[pid]
-        return f"Freed {size}KB from process '{name}' (PID: {pid})."
-    except ValueError:
-        return "Invalid Process ID."
+    return manager.free(process_id)
 
 def compact_memory():
-    global memory
-    new_memory = [None] * TOTAL_BLOCKS
-    new_index = 0
-    for pid in sorted(processes):
-        proc = processes[pid]
-        size = proc['size']
-        for i in range(size):
-            new_memory[new_index + i] = (pid, proc['color'])
-        proc['start'] = new_index
-        new_index += size
-    memory = new_memory
-    return "Memory compaction completed."
+    return manager.compact_memory()
+
+def compact_step(max_blocks=None):
+    return manager.compact_step(max_blocks)
+
+def stats():
+    return manager.stats()
 
 def get_memory_blocks():
     """Returns a list of (PID, color) or None for each block"""
-    return memory.copy()
+    return manager.get_memory_blocks()
 
 def get_memory_state():
-    block_display = [None if m is None else processes[m[0]]['name'] for m in memory]
-    process_table = [{
-        'PID': pid,
-        'Name': info['name'],
-        'Start': info['start'],
-        'Size': info['size'],
-        'Status': info['status'],
-        'Allocated': info['alloc_time']
-    } for pid, info in processes.items()]
-    return {
-        'blocks': block_display,
-        'process_table': sorted(process_table, key=lambda x: x['Start'])
-    }
+    return manager.get_memory_state()
 
 def reset_memory():
-    global memory, processes, next_pid
-    memory = [None] * TOTAL_BLOCKS
-    processes = {}
-    next_pid = 1
-    return "Memory has been completely reset."
-
-def get_memory_blocks():
-    """Returns list of (pid, color) tuples or None"""
-    return memory.copy()
+    return manager.reset()
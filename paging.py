@@ -0,0 +1,440 @@
+# paging.py
+import heapq
+import random
+from array import array
+from collections import Counter
+from itertools import repeat
+
+from memory_manager import MemoryManager
+from tlb import ASID_SHIFT, EMPTY
+
+NOT_RESIDENT = -1  # Page table entry of a page that has no frame
+NO_PAGE = -1  # frame_page entry of a free frame
+
+
+class ReplacementPolicy:
+    """Chooses which resident frame to evict when every frame is in use"""
+    name = ''
+
+    def __init__(self, frames):
+        self.frames = frames
+
+    def load(self, frame, i):
+        pass
+
+    def touch(self, frame, i):
+        pass
+
+    def victim(self):
+        raise NotImplementedError
+
+    def unload(self, frame):
+        pass
+
+
+class LRUReplacement(ReplacementPolicy):
+    """Evict the least recently used page (array-backed doubly linked list)"""
+    name = 'LRU'
+
+    def __init__(self, frames):
+        super().__init__(frames)
+        self.prev = array('i', [frames]) * (frames + 1)
+        self.next = array('i', [frames]) * (frames + 1)
+
+    def unlink(self, frame):
+        prev, next_ = self.prev, self.next
+        p, n = prev[frame], next_[frame]
+        next_[p] = n
+        prev[n] = p
+
+    def append(self, frame):
+        sentinel = self.frames
+        tail = self.prev[sentinel]
+        self.next[tail] = frame
+        self.prev[frame] = tail
+        self.next[frame] = sentinel
+        self.prev[sentinel] = frame
+
+    def load(self, frame, i):
+        self.append(frame)
+
+    def touch(self, frame, i):
+        prev, next_, sentinel = self.prev, self.next, self.frames
+        n = next_[frame]
+        if n != sentinel:  # Already most recent otherwise
+            p = prev[frame]
+            next_[p] = n
+            prev[n] = p
+            tail = prev[sentinel]
+            next_[tail] = frame
+            prev[frame] = tail
+            next_[frame] = sentinel
+            prev[sentinel] = frame
+
+    def victim(self):
+        frame = self.next[self.frames]
+        self.unlink(frame)
+        return frame
+
+    def unload(self, frame):
+        self.unlink(frame)
+
+
+class FIFOReplacement(LRUReplacement):
+    """Evict the page that has been resident longest: LRU order that hits don't change"""
+    name = 'FIFO'
+
+    def touch(self, frame, i):
+        pass
+
+
+class ClockReplacement(ReplacementPolicy):
+    """Second chance: a hand sweeps the frames, sparing (and clearing) referenced ones"""
+    name = 'Clock'
+
+    def __init__(self, frames):
+        super().__init__(frames)
+        self.referenced = bytearray(frames)
+        self.hand = 0
+
+    def load(self, frame, i):
+        self.referenced[frame] = 1
+
+    def touch(self, frame, i):
+        self.referenced[frame] = 1
+
+    def victim(self):
+        referenced = self.referenced
+        while referenced[self.hand]:
+            referenced[self.hand] = 0
+            self.hand = (self.hand + 1) % self.frames
+        frame = self.hand
+        self.hand = (self.hand + 1) % self.frames
+        return frame
+
+    def unload(self, frame):
+        self.referenced[frame] = 0
+
+
+class OptimalReplacement(ReplacementPolicy):
+    """Belady's algorithm: evict the page whose next use is farthest away"""
+    name = 'Optimal'
+
+    def __init__(self, frames):
+        super().__init__(frames)
+        self.next_use = None
+        self.frame_next = array('q', [-1]) * frames
+        self.heap = []  # -next_use * frames + frame: farthest next use (then lowest frame) on top
+
+    def set_future(self, next_use, frame_next):
+        """Switch to a new reference string; `frame_next` holds each resident page's first use in it"""
+        self.next_use = next_use
+        self.frame_next = frame_next
+        self.heap = [frame - n * self.frames for frame, n in enumerate(frame_next) if n >= 0]
+        heapq.heapify(self.heap)
+
+    def push(self, frame, next_use):
+        self.frame_next[frame] = next_use
+        heap = self.heap
+        heapq.heappush(heap, frame - next_use * self.frames)
+        if len(heap) > 2 * self.frames + 64:
+            # Keep only the entry of each frame's current page
+            self.heap = heap = [frame - n * self.frames for frame, n in enumerate(self.frame_next) if n >= 0]
+            heapq.heapify(heap)
+
+    def load(self, frame, i):
+        self.push(frame, self.next_use[i])
+
+    def touch(self, frame, i):
+        self.push(frame, self.next_use[i])
+
+    def victim(self):
+        heap, frames, frame_next = self.heap, self.frames, self.frame_next
+        while True:
+            entry = heapq.heappop(heap)
+            frame = entry % frames
+            if frame_next[frame] == (frame - entry) // frames:
+                frame_next[frame] = -1
+                return frame
+
+    def unload(self, frame):
+        self.frame_next[frame] = -1
+
+
+REPLACEMENT_POLICIES = {
+    'FIFO': FIFOReplacement,
+    'LRU': LRUReplacement,
+    'Clock': ClockReplacement,
+    'Optimal': OptimalReplacement,
+}
+
+
+class VirtualMemory:
+    """Demand-paged virtual memory over a frame pool allocated from a MemoryManager arena"""
+
+    def __init__(self, frames, page_blocks=1, policy='LRU', memory=None, tlb=None):
+        if frames <= 0 or page_blocks <= 0:
+            raise ValueError("Frame count and page size must be positive.")
+        if policy not in REPLACEMENT_POLICIES:
+            raise ValueError(f"Unknown replacement policy '{policy}'.")
+        if memory is None:
+            memory = MemoryManager(frames * page_blocks)
+        self.memory = memory
+        self.frames = frames
+        self.page_blocks = page_blocks
+        self.page_size = page_blocks * memory.block_size  # KB per page
+
+        method = 'Buddy' if memory.allocator == 'buddy' else 'First-Fit'
+        self.pool_pid = memory.next_pid
+        self.pool_start = memory.allocate(frames * page_blocks, method, name="Page frames")
+        if self.pool_start is None:
+            raise ValueError(f"No room in the arena for {frames} frames of {page_blocks} blocks.")
+
+        self.policy_name = policy
+        self.tlb = tlb
+        self.page_tables = {}  # PID: array of frame numbers
+        self.reset()
+
+    def reset(self):
+        """Empty every frame and page table and zero the counters"""
+        self.frame_pid = array('i', [0]) * self.frames
+        self.frame_page = array('q', [NO_PAGE]) * self.frames
+        self.free_frames = list(range(self.frames - 1, -1, -1))  # Stack; lowest frame on top
+        for table in self.page_tables.values():
+            table[:] = array('i', [NOT_RESIDENT]) * len(table)
+        self.policy = REPLACEMENT_POLICIES[self.policy_name](self.frames)
+        self.accesses = Counter()  # PID: references
+        self.faults = Counter()  # PID: page faults
+        self.evictions = 0
+        if self.tlb is not None:
+            self.tlb.clear()
+
+    def close(self):
+        """Give the frame pool back to the arena"""
+        self.memory.release(self.pool_pid)
+
+    def add_process(self, pid, pages):
+        """Create an empty page table of `pages` pages for `pid`"""
+        if pid in self.page_tables:
+            raise ValueError(f"P{pid} already has a page table.")
+        self.page_tables[pid] = array('i', [NOT_RESIDENT]) * pages
+        if self.tlb is not None:
+            self.tlb.asid(pid)
+
+    def remove_process(self, pid):
+        """Drop `pid`'s page table and free its frames"""
+        table = self.page_tables.pop(pid)
+        if self.tlb is not None:
+            self.tlb.flush(self.tlb.asid(pid))
+        for frame in table:
+            if frame != NOT_RESIDENT:
+                self.policy.unload(frame)
+                self.frame_page[frame] = NO_PAGE
+                self.free_frames.append(frame)
+
+    def fault(self, pid, page, i):
+        """Bring `page` of `pid` into a frame, evicting if needed; return the frame"""
+        if self.free_frames:
+            frame = self.free_frames.pop()
+        else:
+            frame = self.policy.victim()
+            old_pid, old_page = self.frame_pid[frame], self.frame_page[frame]
+            self.page_tables[old_pid][old_page] = NOT_RESIDENT
+            if self.tlb is not None:
+                self.tlb.invalidate(self.tlb.asid(old_pid), old_page)
+            self.evictions += 1
+        self.frame_pid[frame] = pid
+        self.frame_page[frame] = page
+        self.page_tables[pid][page] = frame
+        self.policy.load(frame, i)
+        self.faults[pid] += 1
+        return frame
+
+    def run(self, pages, pids=None, pid=None):
+        """Replay a reference string of page numbers for `pids` (or all for `pid`); return the faults"""
+        if pids is None and pid is None:
+            raise ValueError("Give the process of the references with pids or pid.")
+        if self.policy_name == 'Optimal':
+            next_use, first = scan_future(pages, pids)
+            self.policy.set_future(next_use, self.first_uses({pid: first} if pids is None else first, len(pages)))
+        if self.tlb is not None:
+            return self.run_with_tlb(pages, pids, pid)
+
+        touch = self.policy.touch
+        fault = self.fault
+        faults = 0
+        if pids is None:
+            self.accesses[pid] += len(pages)
+            table = self.page_tables[pid]
+            for i, page in enumerate(pages):
+                frame = table[page]
+                if frame == NOT_RESIDENT:
+                    fault(pid, page, i)
+                    faults += 1
+                else:
+                    touch(frame, i)
+            return faults
+
+        self.accesses.update(pids)
+        tables = self.page_tables
+        for i, (pid, page) in enumerate(zip(pids, pages)):
+            frame = tables[pid][page]
+            if frame == NOT_RESIDENT:
+                fault(pid, page, i)
+                faults += 1
+            else:
+                touch(frame, i)
+        return faults
+
+    def first_uses(self, first, count):
+        """First position of each resident page in a coming string (`count` if never, -1 for free frames)"""
+        uses = array('q', [-1]) * self.frames
+        for frame, page in enumerate(self.frame_page):
+            if page != NO_PAGE:
+                positions = first.get(self.frame_pid[frame])
+                uses[frame] = positions[page] if positions is not None and page < len(positions) else count
+        return uses
+
+    def run_with_tlb(self, pages, pids, pid):
+        """run() with every reference going through the TLB first"""
+        if pids is None:
+            self.accesses[pid] += len(pages)
+            pids = repeat(pid, len(pages))
+        else:
+            self.accesses.update(pids)
+        tlb = self.tlb
+        asids, slots = tlb.asids, tlb.slots
+        frames, stamps, hits, misses = tlb.frames, tlb.stamps, tlb.hits, tlb.misses
+        fill = tlb.fill
+        clock = tlb.clock
+        tables = self.page_tables
+        touch = self.policy.touch
+        fault = self.fault
+        faults = 0
+        for i, (pid, page) in enumerate(zip(pids, pages)):
+            asid = asids[pid]
+            slot = slots.get(asid << ASID_SHIFT | page, EMPTY)
+            if slot == EMPTY:
+                misses[asid] += 1
+                frame = tables[pid][page]
+                if frame == NOT_RESIDENT:
+                    frame = fault(pid, page, i)
+                    faults += 1
+                else:
+                    touch(frame, i)
+                tlb.clock = clock
+                fill(asid, page, frame)
+                clock = tlb.clock
+            else:
+                hits[asid] += 1
+                clock += 1
+                stamps[slot] = clock
+                touch(frames[slot], i)
+        tlb.clock = clock
+        return faults
+
+    def translate(self, pid, address, i=0):
+        """Physical address (in KB from the start of the arena) of a virtual address"""
+        if self.policy_name == 'Optimal':
+            raise ValueError("Optimal replacement needs the whole reference string; use run().")
+        page, offset = divmod(address, self.page_size)
+        self.accesses[pid] += 1
+        tlb = self.tlb
+        frame = EMPTY if tlb is None else tlb.lookup(tlb.asids[pid], page)
+        if frame == EMPTY:
+            frame = self.page_tables[pid][page]
+            if frame == NOT_RESIDENT:
+                frame = self.fault(pid, page, i)
+            else:
+                self.policy.touch(frame, i)
+            if tlb is not None:
+                tlb.fill(tlb.asids[pid], page, frame)
+        else:
+            self.policy.touch(frame, i)
+        return (self.pool_start + frame * self.page_blocks) * self.memory.block_size + offset
+
+    def stats(self):
+        """Accesses, faults and fault rate, overall and per process, plus TLB stats if attached"""
+        accesses = sum(self.accesses.values())
+        faults = sum(self.faults.values())
+        stats = {
+            'policy': self.policy_name,
+            'frames': self.frames,
+            'accesses': accesses,
+            'faults': faults,
+            'fault_rate': faults / accesses if accesses else 0.0,
+            'evictions': self.evictions,
+            'processes': {
+                pid: {
+                    'accesses': self.accesses[pid],
+                    'faults': self.faults[pid],
+                    'fault_rate': self.faults[pid] / self.accesses[pid] if self.accesses[pid] else 0.0,
+                } for pid in self.accesses
+            },
+        }
+        if self.tlb is not None:
+            stats['tlb'] = self.tlb.stats()
+        return stats
+
+
+def next_uses(pages, pids=None):
+    """Position of the next reference to the same page after each reference (len(pages) if none)"""
+    return scan_future(pages, pids)[0]
+
+
+def scan_future(pages, pids=None):
+    """next_uses() and the first position of each page, as an array by page (a dict of them by PID with `pids`)"""
+    count = len(pages)
+    next_use = array('q', [count]) * count
+    if pids is None:
+        last = array('q', [count]) * (max(pages) + 1 if count else 0)
+        for i in range(count - 1, -1, -1):
+            page = pages[i]
+            next_use[i] = last[page]
+            last[page] = i
+        return next_use, last
+
+    last = {}  # PID: array of positions, one per page seen
+    for i in range(count - 1, -1, -1):
+        pid, page = pids[i], pages[i]
+        positions = last.get(pid)
+        if positions is None or page >= len(positions):
+            grown = array('q', [count]) * (page + 1)
+            if positions is not None:
+                grown[:len(positions)] = positions
+            last[pid] = positions = grown
+        next_use[i] = positions[page]
+        positions[page] = i
+    return next_use, last
+
+
+def reference_string(count, pages, working_set=8, shift=0.001, seed=None):
+    """`count` page numbers in [0, pages) with locality around a drifting working set"""
+    rng = random.Random(seed)
+    base = 0
+    refs = array('i', [0]) * count
+    for i in range(count):
+        if rng.random() < shift:
+            base = rng.randrange(pages)
+        refs[i] = (base + rng.randrange(working_set)) % pages
+    return refs
+
+
+def compare_policies(pages, frames, pids=None, pid=0, page_count=None):
+    """Fault rate of every replacement policy on one reference string"""
+    if pids is None:
+        owners = {pid: (max(pages) + 1 if page_count is None else page_count)}
+    else:
+        owners = {}
+        for owner, page in zip(pids, pages):
+            owners[owner] = max(owners.get(owner, 0), page + 1)
+
+    results = []
+    for policy in REPLACEMENT_POLICIES:
+        vm = VirtualMemory(frames, policy=policy)
+        for owner, size in owners.items():
+            vm.add_process(owner, size)
+        vm.run(pages, pids, pid)
+        stats = vm.stats()
+        results.append({key: stats[key] for key in ('policy', 'frames', 'accesses', 'faults', 'fault_rate')})
+    return results
@@ -0,0 +1,261 @@
+# policies.py
+import heapq
+from collections import deque
+
+
+class ReadyQueue:
+    """FIFO of runnable process rows with O(1) enqueue, dispatch and rotation"""
+
+    def __init__(self):
+        self.queue = deque()
+
+    def push(self, row):
+        """Append a newly arrived process to the tail"""
+        self.queue.append(row)
+
+    def pop(self):
+        """Remove and return the process at the head"""
+        return self.queue.popleft()
+
+    def peek(self):
+        return self.queue[0]
+
+    def rotate(self, row):
+        """Send a preempted process to the back of the line"""
+        self.queue.append(row)
+
+    def clear(self):
+        self.queue.clear()
+
+    def __len__(self):
+        return len(self.queue)
+
+    def __iter__(self):
+        return iter(self.queue)
+
+
+class SchedulingPolicy:
+    """Decides which ready process runs next and for how long"""
+    name = ''
+    preemptive = False
+    table = None
+
+    def bind(self, table):
+        self.table = table
+
+    def push(self, row):
+        raise NotImplementedError
+
+    def pop(self):
+        raise NotImplementedError
+
+    def peek(self):
+        raise NotImplementedError
+
+    def requeue(self, row):
+        """Put back a process whose time slice expired"""
+        self.push(row)
+
+    def time_slice(self, row):
+        """Length of the next slice for `row`, or None to run it to completion"""
+        return None
+
+    def preempts(self, running, remaining, candidate):
+        """True if row `candidate` should take the CPU from row `running`"""
+        return False
+
+    def finished(self, row):
+        """Forget any per-process state once `row` completes"""
+
+    def clear(self):
+        raise NotImplementedError
+
+    def __len__(self):
+        raise NotImplementedError
+
+    def __iter__(self):
+        raise NotImplementedError
+
+
+class FCFSPolicy(SchedulingPolicy):
+    """First-Come-First-Served: run processes to completion in arrival order"""
+    name = 'FCFS'
+
+    def __init__(self):
+        self.ready = ReadyQueue()
+
+    def push(self, row):
+        self.ready.push(row)
+
+    def pop(self):
+        return self.ready.pop()
+
+    def peek(self):
+        return self.ready.peek()
+
+    def requeue(self, row):
+        self.ready.rotate(row)
+
+    def clear(self):
+        self.ready.clear()
+
+    def __len__(self):
+        return len(self.ready)
+
+    def __iter__(self):
+        return iter(self.ready)
+
+
+class RoundRobinPolicy(FCFSPolicy):
+    """FIFO rotation with a fixed time quantum"""
+    name = 'RR'
+
+    def __init__(self, quantum=2):
+        super().__init__()
+        self.quantum = quantum
+
+    def time_slice(self, row):
+        return self.quantum
+
+
+class HeapPolicy(SchedulingPolicy):
+    """Base for policies that keep the ready set in a binary heap, FIFO on equal keys"""
+
+    def __init__(self):
+        self.heap = []
+        self.seq = 0
+
+    def key(self, row):
+        raise NotImplementedError
+
+    def push(self, row):
+        heapq.heappush(self.heap, (self.key(row), self.seq, row))
+        self.seq += 1
+
+    def pop(self):
+        return heapq.heappop(self.heap)[2]
+
+    def peek(self):
+        return self.heap[0][2]
+
+    def clear(self):
+        self.heap = []
+
+    def __len__(self):
+        return len(self.heap)
+
+    def __iter__(self):
+        return (entry[2] for entry in self.heap)
+
+
+class SJFPolicy(HeapPolicy):
+    """Non-preemptive Shortest Job First"""
+    name = 'SJF'
+
+    def key(self, row):
+        return self.table.remaining[row]
+
+
+class SRTFPolicy(SJFPolicy):
+    """Preemptive Shortest Remaining Time First"""
+    name = 'SRTF'
+    preemptive = True
+
+    def preempts(self, running, remaining, candidate):
+        return self.table.remaining[candidate] < remaining
+
+
+class PriorityPolicy(HeapPolicy):
+    """Priority scheduling; lower numbers run first"""
+    name = 'Priority'
+
+    def __init__(self, preemptive=False):
+        super().__init__()
+        self.preemptive = preemptive
+
+    def key(self, row):
+        return self.table.priority[row]
+
+    def preempts(self, running, remaining, candidate):
+        priority = self.table.priority
+        return self.preemptive and priority[candidate] < priority[running]
+
+
+class MLFQPolicy(SchedulingPolicy):
+    """Multi-Level Feedback Queue"""
+    name = 'MLFQ'
+    preemptive = True
+
+    def __init__(self, quanta=(2, 4, 8)):
+        self.quanta = list(quanta) + [None]
+        self.levels = [ReadyQueue() for _ in self.quanta]
+        self.level_of = {}  # Row: current level
+        self.count = 0
+
+    def push(self, row):
+        level = self.level_of.setdefault(row, 0)
+        self.levels[level].push(row)
+        self.count += 1
+
+    def requeue(self, row):
+        level = min(self.level_of.get(row, 0) + 1, len(self.levels) - 1)
+        self.level_of[row] = level
+        self.levels[level].rotate(row)
+        self.count += 1
+
+    def top_level(self):
+        for level, queue in enumerate(self.levels):
+            if queue:
+                return level
+        raise IndexError("pop from empty MLFQ")
+
+    def pop(self):
+        self.count -= 1
+        return self.levels[self.top_level()].pop()
+
+    def peek(self):
+        return self.levels[self.top_level()].peek()
+
+    def time_slice(self, row):
+        return self.quanta[self.level_of.get(row, 0)]
+
+    def preempts(self, running, remaining, candidate):
+        return self.level_of.get(candidate, 0) < self.level_of.get(running, 0)
+
+    def finished(self, row):
+        self.level_of.pop(row, None)
+
+    def clear(self):
+        for queue in self.levels:
+            queue.clear()
+        self.level_of = {}
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        for queue in self.levels:
+            yield from queue
+
+
+POLICIES = {
+    'FCFS': FCFSPolicy,
+    'RR': RoundRobinPolicy,
+    'SJF': SJFPolicy,
+    'SRTF': SRTFPolicy,
+    'Priority': PriorityPolicy,
+    'Priority-P': lambda: PriorityPolicy(preemptive=True),
+    'MLFQ': MLFQPolicy,
+}
+
+
+def make_policy(name, quantum=2):
+    """Build a policy by name; quantum-based policies scale from `quantum`"""
+    if name not in POLICIES:
+        raise ValueError(f"Unknown scheduling policy '{name}'.")
+    if name == 'RR':
+        return RoundRobinPolicy(quantum)
+    if name == 'MLFQ':
+        return MLFQPolicy((quantum, quantum * 2, quantum * 4))
+    return POLICIES[name]()
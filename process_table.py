@@ -0,0 +1,207 @@
+# process_table.py
+from array import array
+from collections.abc import Mapping
+
+STATUSES = ('Ready', 'Running', 'Completed')
+READY, RUNNING, COMPLETED = range(len(STATUSES))
+STATUS_CODES = {name: code for code, name in enumerate(STATUSES)}
+FREE = len(STATUSES)  # Released row waiting to be reused; never shown to callers
+
+NONE = -1  # Stored in start/end columns until the time is known
+
+# Dict key: column attribute
+FIELDS = {
+    'pid': 'pid',
+    'name': 'names',
+    'burst_time': 'burst',
+    'remaining_time': 'remaining',
+    'priority': 'priority',
+    'arrival_time': 'arrival',
+    'status': 'status',
+    'start_time': 'start',
+    'end_time': 'end',
+    'context_switches': 'switches',
+}
+
+
+class ProcessTable:
+    """Process records stored column-wise in typed arrays"""
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.pid = array('q')
+        self.names = []
+        self.burst = array('q')
+        self.remaining = array('q')
+        self.priority = array('q')
+        self.arrival = array('q')
+        self.status = bytearray()
+        self.start = array('q')
+        self.end = array('q')
+        self.switches = array('i')  # Times a core switched to this process
+        self.last_cpu = array('i')  # Core it last ran on, for migration costs
+        self.first_pid = None
+        self.pid_index = {}  # PID: row, for PIDs outside the first_pid sequence
+        self.status_counts = [0] * (len(STATUSES) + 1)
+        # Rows of each status as a doubly linked list, so one status is listed without a full scan
+        self.status_head = [NONE] * (len(STATUSES) + 1)
+        self.status_prev = array('i')
+        self.status_next = array('i')
+        self.free_rows = []
+
+    def append(self, pid, name, burst_time, priority, arrival_time):
+        """Add a Ready process and return its row"""
+        if self.free_rows:
+            return self.reuse(self.free_rows.pop(), pid, name, burst_time, priority, arrival_time)
+
+        row = len(self.pid)
+        self.pid.append(pid)
+        self.names.append(name)
+        self.burst.append(burst_time)
+        self.remaining.append(burst_time)
+        self.priority.append(priority)
+        self.arrival.append(arrival_time)
+        self.status.append(READY)
+        self.start.append(NONE)
+        self.end.append(NONE)
+        self.switches.append(0)
+        self.last_cpu.append(NONE)
+        self.status_prev.append(NONE)
+        self.status_next.append(NONE)
+        self.link(row, READY)
+        self.status_counts[READY] += 1
+        if self.first_pid is None:
+            self.first_pid = pid
+        if pid != self.first_pid + row:
+            self.pid_index[pid] = row
+        return row
+
+    def reuse(self, row, pid, name, burst_time, priority, arrival_time):
+        self.pid[row] = pid
+        self.names[row] = name
+        self.burst[row] = burst_time
+        self.remaining[row] = burst_time
+        self.priority[row] = priority
+        self.arrival[row] = arrival_time
+        self.start[row] = NONE
+        self.end[row] = NONE
+        self.switches[row] = 0
+        self.last_cpu[row] = NONE
+        self.set_status(row, READY)
+        if self.first_pid is None or pid != self.first_pid + row:
+            self.pid_index[pid] = row
+        return row
+
+    def release(self, row):
+        """Forget the process in `row` and make the row available again"""
+        pid = self.pid[row]
+        self.pid_index.pop(pid, None)
+        self.pid[row] = NONE
+        self.names[row] = None
+        self.set_status(row, FREE)
+        self.free_rows.append(row)
+
+    def row_of(self, pid):
+        """Row holding `pid`, or None"""
+        if self.first_pid is not None and pid != NONE:
+            row = pid - self.first_pid
+            if 0 <= row < len(self.pid) and self.pid[row] == pid:
+                return row
+        return self.pid_index.get(pid)
+
+    def link(self, row, code):
+        head = self.status_head[code]
+        self.status_prev[row] = NONE
+        self.status_next[row] = head
+        if head != NONE:
+            self.status_prev[head] = row
+        self.status_head[code] = row
+
+    def unlink(self, row, code):
+        prev, next_ = self.status_prev[row], self.status_next[row]
+        if prev != NONE:
+            self.status_next[prev] = next_
+        else:
+            self.status_head[code] = next_
+        if next_ != NONE:
+            self.status_prev[next_] = prev
+
+    def set_status(self, row, code):
+        old = self.status[row]
+        if old != code:
+            self.unlink(row, old)
+            self.link(row, code)
+            self.status_counts[old] -= 1
+            self.status_counts[code] += 1
+            self.status[row] = code
+
+    def rows_with(self, code):
+        """Rows currently in status `code`, in row order; O(k log k) for k such rows"""
+        rows = []
+        row, next_ = self.status_head[code], self.status_next
+        while row != NONE:
+            rows.append(row)
+            row = next_[row]
+        rows.sort()
+        return rows
+
+    def count(self, code):
+        return self.status_counts[code]
+
+    def nbytes(self):
+        """Bytes held by the numeric and status columns"""
+        columns = (self.pid, self.burst, self.remaining, self.priority,
+                   self.arrival, self.start, self.end, self.switches, self.last_cpu,
+                   self.status_prev, self.status_next)
+        return sum(c.itemsize * len(c) for c in columns) + len(self.status)
+
+    def __len__(self):
+        return len(self.pid) - len(self.free_rows)
+
+    def __getitem__(self, row):
+        if not 0 <= row < len(self.pid) or self.status[row] == FREE:
+            raise IndexError(row)
+        return ProcessView(self, row)
+
+    def __iter__(self):
+        for row in range(len(self.pid)):
+            if self.status[row] != FREE:
+                yield ProcessView(self, row)
+
+
+class ProcessView(Mapping):
+    """Dict-like window onto one row of a ProcessTable"""
+    __slots__ = ('table', 'row')
+
+    def __init__(self, table, row):
+        self.table = table
+        self.row = row
+
+    def __getitem__(self, key):
+        value = getattr(self.table, FIELDS[key])[self.row]
+        if key == 'status':
+            return STATUSES[value]
+        if key in ('start_time', 'end_time') and value == NONE:
+            return None
+        return value
+
+    def __setitem__(self, key, value):
+        if key == 'status':
+            self.table.set_status(self.row, STATUS_CODES[value])
+            return
+        if key == 'pid':
+            raise KeyError("pid is read-only")
+        if key in ('start_time', 'end_time') and value is None:
+            value = NONE
+        getattr(self.table, FIELDS[key])[self.row] = value
+
+    def __iter__(self):
+        return iter(FIELDS)
+
+    def __len__(self):
+        return len(FIELDS)
+
+    def __repr__(self):
+        return repr(dict(self))
@@ -1,16 +1,205 @@
 # scheduler.py
+import copy
+import heapq
+import math
+import pickle
 import time
-from collections import deque
+from array import array
+from itertools import accumulate, islice
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; batch_schedule falls back to pure Python
+    np = None
+
+from policies import SchedulingPolicy, make_policy
+from process_table import COMPLETED, READY, RUNNING, NONE, STATUS_CODES, ProcessTable
+from timeline import TimelineSink
+from workload import NO_CPU, normalize
+
+# Event kinds. At equal timestamps arrivals are queued before the running
+# slice ends, so a preempted process goes behind anything that just arrived.
+ARRIVAL = 0
+COMPLETION = 1
+QUANTUM_EXPIRY = 2
+
+# 'global': every core pulls from one shared run queue.
+# 'per-cpu': each core has its own queue; idle cores steal from the busiest.
+QUEUE_MODES = ('global', 'per-cpu')
+
+CHECKPOINT_MAGIC = b'MOSCKP01'
+
+
+class QuantileSketch:
+    """Streaming quantile estimate with bounded relative error"""
+
+    def __init__(self, accuracy=0.01):
+        self.gamma = (1 + accuracy) / (1 - accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.clear()
+
+    def clear(self):
+        self.counts = array('q')  # counts[k] holds values in (gamma**(k-1), gamma**k]
+        self.zeros = 0
+        self.count = 0
+
+    def add(self, value):
+        self.count += 1
+        if value <= 0:
+            self.zeros += 1
+            return
+        key = max(0, math.ceil(math.log(value) / self.log_gamma))
+        if key >= len(self.counts):
+            self.counts.extend([0] * (key + 1 - len(self.counts)))
+        self.counts[key] += 1
+
+    def quantiles(self, *qs):
+        """Estimates for each of the ascending quantiles `qs`, in one pass"""
+        if not self.count:
+            return [0.0] * len(qs)
+        results = []
+        ranks = iter(q * (self.count - 1) for q in qs)
+        rank = next(ranks)
+        seen = self.zeros
+        while rank is not None and rank < seen:
+            results.append(0.0)
+            rank = next(ranks, None)
+        for key, bucket in enumerate(self.counts):
+            seen += bucket
+            while rank is not None and rank < seen:
+                # Midpoint of the bucket, relatively close to both ends
+                results.append(2 * self.gamma ** key / (self.gamma + 1))
+                rank = next(ranks, None)
+            if rank is None:
+                break
+        return results
+
+
+class SchedulingMetrics:
+    """Running aggregates over completed processes"""
 
-class ProcessScheduler:
     def __init__(self):
-        self.process_queue = []
-        self.schedule_history = []
+        self.waiting = QuantileSketch()
+        self.turnaround = QuantileSketch()
+        self.clear()
+
+    def clear(self):
+        self.completed = 0
+        self.total_waiting = 0
+        self.total_turnaround = 0
+        self.busy_time = 0  # Process execution time summed over all cores
+        self.first_arrival = None
+        self.last_end = None
+        self.share_sum = 0.0
+        self.share_squares = 0.0
+        self.waiting.clear()
+        self.turnaround.clear()
+
+    def record_slice(self, duration):
+        self.busy_time += duration
+
+    def record_completion(self, arrival, burst, end):
+        turnaround = end - arrival
+        waiting = turnaround - burst
+        self.completed += 1
+        self.total_waiting += waiting
+        self.total_turnaround += turnaround
+        self.waiting.add(waiting)
+        self.turnaround.add(turnaround)
+        if self.first_arrival is None or arrival < self.first_arrival:
+            self.first_arrival = arrival
+        if self.last_end is None or end > self.last_end:
+            self.last_end = end
+        share = burst / turnaround if turnaround else 1.0
+        self.share_sum += share
+        self.share_squares += share * share
+
+    def summary(self, cores=1):
+        """Averages, percentiles, throughput, utilization and fairness so far"""
+        count = self.completed
+        makespan = self.last_end - self.first_arrival if count else 0
+        waiting = self.waiting.quantiles(0.5, 0.95, 0.99)
+        turnaround = self.turnaround.quantiles(0.5, 0.95, 0.99)
+        return {
+            'completed': count,
+            'avg_waiting': self.total_waiting / count if count else 0.0,
+            'p50_waiting': waiting[0],
+            'p95_waiting': waiting[1],
+            'p99_waiting': waiting[2],
+            'avg_turnaround': self.total_turnaround / count if count else 0.0,
+            'p50_turnaround': turnaround[0],
+            'p95_turnaround': turnaround[1],
+            'p99_turnaround': turnaround[2],
+            'throughput': count / makespan if makespan else 0.0,
+            'utilization': self.busy_time / (cores * makespan) if makespan else 0.0,
+            'fairness': self.share_sum ** 2 / (count * self.share_squares) if count else 0.0,
+            'makespan': makespan,
+        }
+
+
+class ProcessScheduler:
+    def __init__(self, history_limit=None, spill_path=None, history_detail=False,
+                 cores=1, queue_mode='global', steal_cost=0,
+                 context_switch_cost=0, migration_cost=0):
+        if cores < 1:
+            raise ValueError("A scheduler needs at least one core.")
+        if queue_mode not in QUEUE_MODES:
+            raise ValueError(f"Queue mode must be one of {', '.join(QUEUE_MODES)}.")
+
+        self.process_queue = ProcessTable()
+        self.cores = cores
+        self.queue_mode = queue_mode
+        # One Gantt lane per core. Each keeps the last `history_limit`
+        # slices in memory (all of them by default) and optionally every
+        # slice in a binary spill file. Back-to-back slices of one process
+        # are merged unless history_detail asks for every quantum.
+        self.lanes = [
+            TimelineSink(history_limit, lane_spill_path(spill_path, cpu, cores), coalesce=not history_detail)
+            for cpu in range(cores)
+        ]
+        self.schedule_history = self.lanes[0]
         self.current_pid = 1
         self.current_time = 0
         self.quantum = 2  # Default time quantum for Round Robin
+        self.run_queues = []
+        self.set_policy('FCFS')
+        self.events = []  # Heap of (time, kind, seq, row, cpu)
+        self.event_seq = 0
+        self.steal_cost = steal_cost  # Simulated delay before a stolen process starts
+        # Dispatch overheads: switching a core to a different process, and
+        # the cache-warmth penalty for running on another core than last time
+        self.context_switch_cost = context_switch_cost
+        self.migration_cost = migration_cost
+        self.trace = None  # Iterator of jobs still to be fed in by load_trace()
+        self.trace_job = None  # (burst, priority) of the next trace arrival
+        self.trace_consumed = 0  # Jobs read from the trace so far
+        self.retain_completed = True
+        self.metrics = SchedulingMetrics()
+        self.reset_cores()
+
+    def reset_cores(self):
+        self.running = [None] * self.cores  # (row, slice_start, event_seq) per busy core
+        self.idle = list(range(self.cores))  # Heap of cores with nothing to run
+        self.parked = bytearray([1]) * self.cores  # Whether each core is in the idle heap
+        self.wakeups = set()  # Cores to look at once the current timestamp is drained
+        self.arrived = False  # Whether the current timestamp brought new work
+        self.next_cpu = 0  # Round-robin placement when every core is busy
+        self.load_heap = []  # Lazy max-heap of (-queue length, cpu) for work stealing
+        self.steals = 0
+        self.balance_seconds = 0.0  # Host time spent looking for work to steal
+        self.last_pid = [NONE] * self.cores  # Process each core ran last
+        self.context_switches = 0
+        self.migrations = 0
 
-    def add_process(self, name, burst_time):
+    @property
+    def policy(self):
+        """The run queue of CPU 0; the only one in global mode"""
+        return self.run_queues[0]
+
+    def queue_of(self, cpu):
+        return self.run_queues[0] if self.queue_mode == 'global' else self.run_queues[cpu]
+
+    def add_process(self, name, burst_time, priority=0):
         """Add a new process with auto-generated PID and status"""
         try:
             burst_time = int(burst_time)
@@ -18,97 +207,438 @@ class ProcessScheduler:
                 raise ValueError
         except ValueError:
             return "Burst time must be a positive integer."
+        try:
+            priority = int(priority)
+        except ValueError:
+            return "Priority must be an integer."
 
         pid = self.current_pid
         self.current_pid += 1
 
-        self.process_queue.append({
-            'pid': pid,
-            'name': name,
-            'burst_time': burst_time,
-            'remaining_time': burst_time,
-            'arrival_time': self.current_time,
-            'status': 'Ready',
-            'start_time': None,
-            'end_time': None
-        })
+        row = self.process_queue.append(pid, name, burst_time, priority, self.current_time)
+        self.schedule_event(self.current_time, ARRIVAL, row)
         return f"Process '{name}' (PID: {pid}) added with burst time {burst_time}ms."
 
     def reset_processes(self):
         """Clear all processes and reset scheduler state"""
-        self.process_queue = []
-        self.schedule_history = []
+        self.process_queue.clear()
+        for lane in self.lanes:
+            lane.clear()
         self.current_time = 0
+        self.events = []
+        self.event_seq = 0
+        for queue in self.run_queues:
+            queue.clear()
+        self.trace = None
+        self.trace_job = None
+        self.trace_consumed = 0
+        self.retain_completed = True
+        self.metrics.clear()
+        self.reset_cores()
         return "Scheduler has been reset."
 
+    def schedule_event(self, time, kind, row, cpu=-1):
+        """Push an event onto the simulation heap"""
+        heapq.heappush(self.events, (time, kind, self.event_seq, row, cpu))
+        self.event_seq += 1
+
+    def set_policy(self, policy):
+        """Switch to a SchedulingPolicy or a name in POLICIES, carrying over ready processes"""
+        if not isinstance(policy, SchedulingPolicy):
+            policy = make_policy(policy, self.quantum)
+        queues = [policy]
+        if self.queue_mode == 'per-cpu':
+            for _ in range(1, self.cores):
+                queue = copy.deepcopy(policy)
+                queue.clear()
+                queues.append(queue)
+        for queue in queues:
+            queue.bind(self.process_queue)
+
+        for old, new in zip(self.run_queues, queues):
+            for row in old:
+                new.push(row)
+        self.run_queues = queues
+        self.load_heap = [(-len(q), cpu) for cpu, q in enumerate(queues) if q]
+        heapq.heapify(self.load_heap)
+
+    def enqueue(self, cpu, row, requeue=False):
+        """Put a ready process on the run queue serving `cpu`"""
+        queue = self.queue_of(cpu)
+        if requeue:
+            queue.requeue(row)
+        else:
+            queue.push(row)
+        if self.queue_mode == 'per-cpu':
+            heapq.heappush(self.load_heap, (-len(queue), cpu))
+            if len(self.load_heap) > 4 * self.cores + 64:
+                # Drop the stale entries before they pile up
+                self.load_heap = [(-len(q), c) for c, q in enumerate(self.run_queues) if q]
+                heapq.heapify(self.load_heap)
+
+    def place(self, row, cpu=NO_CPU):
+        """Choose a run queue for a newly arrived process"""
+        if self.queue_mode == 'global':
+            self.enqueue(0, row)
+            return
+        if not 0 <= cpu < self.cores:
+            cpu = None
+            while self.idle:
+                candidate = heapq.heappop(self.idle)
+                self.parked[candidate] = 0
+                if self.running[candidate] is None and not self.run_queues[candidate]:
+                    cpu = candidate
+                    break
+            if cpu is None:
+                cpu = self.next_cpu
+                self.next_cpu = (self.next_cpu + 1) % self.cores
+        self.enqueue(cpu, row)
+        self.wakeups.add(cpu)
+
+        # More work than `cpu` can start right away: wake a parked core to steal it
+        backlog = len(self.run_queues[cpu]) - (self.running[cpu] is None)
+        while backlog > 0 and self.idle:
+            thief = heapq.heappop(self.idle)
+            if not self.parked[thief]:
+                continue
+            self.parked[thief] = 0
+            self.wakeups.add(thief)
+            if thief != cpu:  # A pinned job's own core may still be parked
+                break
+
+    def load_trace(self, jobs, retain_completed=True):
+        """Replay (arrival, burst[, priority[, cpu]]) jobs, sorted by arrival, as the clock reaches them"""
+        if self.trace is not None:
+            raise ValueError("A trace is already being replayed.")
+        self.trace = iter(jobs)
+        self.trace_consumed = 0
+        self.retain_completed = retain_completed
+        self.feed_trace()
+
+    def feed_trace(self):
+        """Schedule the arrival of the next trace job, if there is one"""
+        job = next(self.trace, None)
+        if job is None:
+            self.trace = None
+            return
+
+        self.trace_consumed += 1
+        arrival, burst, priority, cpu = normalize(job)
+        if arrival < self.current_time:
+            self.trace = None
+            raise ValueError(f"Trace job arrives at {arrival}, before the current time {self.current_time}.")
+        if burst <= 0:
+            self.trace = None
+            raise ValueError("Trace bursts must be positive integers.")
+        self.trace_job = (burst, priority)
+        self.schedule_event(arrival, ARRIVAL, NONE, cpu)
+
+    def admit_trace_job(self):
+        """Create the process for the trace arrival being handled"""
+        burst, priority = self.trace_job
+        pid = self.current_pid
+        self.current_pid += 1
+        return self.process_queue.append(pid, f"P{pid}", burst, priority, self.current_time)
+
+    def steal(self, cpu):
+        """Take one ready process from the busiest other run queue, or None"""
+        started = time.perf_counter()
+        row = None
+        while self.load_heap:
+            length, victim = self.load_heap[0]
+            queue = self.run_queues[victim]
+            if victim == cpu or not queue:
+                heapq.heappop(self.load_heap)
+                continue
+            if -length != len(queue):
+                # Dispatches don't push their new length; re-key instead of losing the queue
+                heapq.heapreplace(self.load_heap, (-len(queue), victim))
+                continue
+            row = queue.pop()
+            heapq.heapreplace(self.load_heap, (-len(queue), victim))
+            self.steals += 1
+            break
+        self.balance_seconds += time.perf_counter() - started
+        return row
+
+    def dispatch(self, cpu=0):
+        """Start the next ready process on `cpu`; return False if there is none"""
+        delay = 0
+        queue = self.queue_of(cpu)
+        if queue:
+            row = queue.pop()
+        elif self.queue_mode == 'per-cpu' and self.cores > 1:
+            row = self.steal(cpu)
+            if row is None:
+                return False
+            delay = self.steal_cost
+        else:
+            return False
+
+        table = self.process_queue
+        pid = table.pid[row]
+        if self.last_pid[cpu] != NONE and self.last_pid[cpu] != pid:
+            self.context_switches += 1
+            table.switches[row] += 1
+            delay += self.context_switch_cost
+        if table.last_cpu[row] != NONE and table.last_cpu[row] != cpu:
+            self.migrations += 1
+            delay += self.migration_cost
+        self.last_pid[cpu] = pid
+        table.last_cpu[row] = cpu
+
+        start = self.current_time + delay
+        table.set_status(row, RUNNING)
+        if table.start[row] == NONE:
+            table.start[row] = start
+
+        exec_time = table.remaining[row]
+        time_slice = queue.time_slice(row)
+        if time_slice is not None and time_slice < exec_time:
+            kind = QUANTUM_EXPIRY
+            exec_time = time_slice
+        else:
+            kind = COMPLETION
+
+        self.running[cpu] = (row, start, self.event_seq)
+        self.schedule_event(start + exec_time, kind, row, cpu)
+        return True
+
+    def close_slice(self, cpu):
+        """Stop the process running on `cpu` at the current time and record its slice"""
+        row, start, _ = self.running[cpu]
+        end = self.current_time
+        self.running[cpu] = None
+        table = self.process_queue
+        if end <= start:
+            # Preempted before it got going; nothing ran
+            if table.start[row] == start:
+                table.start[row] = NONE
+            return None
+
+        table.remaining[row] -= end - start
+        self.metrics.record_slice(end - start)
+        timeline_entry = {
+            'pid': table.pid[row],
+            'name': table.names[row],
+            'cpu': cpu,
+            'start': start,
+            'end': end,
+            'duration': end - start
+        }
+        self.lanes[cpu].append(timeline_entry['pid'], start, end)
+        return timeline_entry
+
+    def core_idle(self, cpu):
+        """Note that `cpu` has nothing running"""
+        if self.queue_mode == 'global':
+            heapq.heappush(self.idle, cpu)
+        else:
+            self.wakeups.add(cpu)
+
+    def handle_event(self, kind, seq, row, cpu):
+        """Apply one event at the current time; return the slice it closed, if any"""
+        if kind == ARRIVAL:
+            self.arrived = True
+            if row == NONE:
+                row = self.admit_trace_job()
+                self.feed_trace()
+            self.place(row, cpu)
+            return None
+
+        # Slice-end events left behind by a preemption are stale
+        running = self.running[cpu]
+        if running is None or running[2] != seq:
+            return None
+
+        table = self.process_queue
+        timeline_entry = self.close_slice(cpu)
+        if kind == COMPLETION:
+            table.set_status(row, COMPLETED)
+            table.end[row] = timeline_entry['end']
+            self.metrics.record_completion(table.arrival[row], table.burst[row], table.end[row])
+            self.queue_of(cpu).finished(row)
+            if not self.retain_completed:
+                table.release(row)
+        else:
+            table.set_status(row, READY)
+            self.enqueue(cpu, row, requeue=True)
+        self.core_idle(cpu)
+        return timeline_entry
+
+    def preempt(self, cpu):
+        """Give `cpu` to a better ready process if the policy allows it"""
+        queue = self.queue_of(cpu)
+        if self.running[cpu] is None or not queue.preemptive or not queue:
+            return None
+
+        row, start, _ = self.running[cpu]
+        remaining = self.process_queue.remaining[row] - max(self.current_time - start, 0)
+        if not queue.preempts(row, remaining, queue.peek()):
+            return None
+
+        timeline_entry = self.close_slice(cpu)
+        self.process_queue.set_status(row, READY)
+        self.enqueue(cpu, row)
+        self.dispatch(cpu)
+        return timeline_entry
+
+    def schedule_cores(self):
+        """Preempt and dispatch after a timestamp; return the slices preemption closed"""
+        timeline = []
+        if self.queue_mode == 'global':
+            queue = self.run_queues[0]
+            while self.idle and queue:
+                self.dispatch(heapq.heappop(self.idle))
+            if self.arrived and queue.preemptive:
+                for cpu in range(self.cores):
+                    if not queue:
+                        break
+                    entry = self.preempt(cpu)
+                    if entry is not None:
+                        timeline.append(entry)
+        else:
+            wakeups, self.wakeups = self.wakeups, set()
+            for cpu in sorted(wakeups):
+                if self.running[cpu] is not None:
+                    entry = self.preempt(cpu)
+                    if entry is not None:
+                        timeline.append(entry)
+                elif not self.dispatch(cpu) and not self.parked[cpu]:
+                    heapq.heappush(self.idle, cpu)
+                    self.parked[cpu] = 1
+        self.arrived = False
+        return timeline
+
+    def all_completed(self):
+        """True once every submitted process has finished"""
+        table = self.process_queue
+        return table.count(READY) == table.count(RUNNING) == 0 and self.trace is None
+
+    def step(self):
+        """Process every event at the next timestamp and return the slices they closed"""
+        timeline = []
+        if not self.events:
+            return timeline
+
+        self.current_time = self.events[0][0]
+        while self.events and self.events[0][0] == self.current_time:
+            _, kind, seq, row, cpu = heapq.heappop(self.events)
+            entry = self.handle_event(kind, seq, row, cpu)
+            if entry is not None:
+                timeline.append(entry)
+
+        # Preempt and dispatch only once the whole timestamp is drained so
+        # that simultaneous arrivals are all visible to the next pick
+        timeline.extend(self.schedule_cores())
+        return timeline
+
+    def run_until(self, until, collect=True):
+        """Advance the clock to `until`; return the finished slices, or just their count if not `collect`"""
+        timeline, count = [], 0
+        while self.events and self.events[0][0] <= until:
+            slices = self.step()
+            count += len(slices)
+            if collect:
+                timeline.extend(slices)
+        self.current_time = max(self.current_time, until)
+        return timeline if collect else count
+
+    def run_to_completion(self, collect=True):
+        """Run until no events remain; return the finished slices, or just their count if not `collect`"""
+        timeline, count = [], 0
+        while self.events:
+            slices = self.step()
+            count += len(slices)
+            if collect:
+                timeline.extend(slices)
+        return timeline if collect else count
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        # A trace iterator can't be pickled; restore() takes it again
+        state['trace'] = self.trace is not None
+        return state
+
+    def checkpoint(self):
+        """Snapshot the whole engine as bytes"""
+        return CHECKPOINT_MAGIC + pickle.dumps(self, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def restore(cls, data, trace=None, spill_path=None):
+        """Build a scheduler from checkpoint() bytes, ready to keep running"""
+        if data[:len(CHECKPOINT_MAGIC)] != CHECKPOINT_MAGIC:
+            raise ValueError("Not a MiniOS scheduler checkpoint.")
+        scheduler = pickle.loads(data[len(CHECKPOINT_MAGIC):])
+
+        if spill_path is None and any(lane.spill_path for lane in scheduler.lanes):
+            raise ValueError("The checkpoint spills its history; pass a new spill_path for the restored run.")
+        for cpu, lane in enumerate(scheduler.lanes):
+            lane.resume_spill(lane_spill_path(spill_path, cpu, scheduler.cores))
+        if scheduler.trace:
+            if trace is None:
+                raise ValueError("The checkpoint was taken mid-trace; pass the trace to resume it.")
+            scheduler.trace = islice(iter(trace), scheduler.trace_consumed, None)
+        else:
+            scheduler.trace = None
+        return scheduler
+
     def fcfs_schedule(self):
         """First-Come-First-Served scheduling algorithm"""
         if not self.process_queue:
             return "No processes to schedule."
 
-        timeline = []
-        current_time = self.current_time
-
-        for process in sorted(self.process_queue, key=lambda p: p['arrival_time']):
-            if process['status'] != 'Completed':
-                process['status'] = 'Running'
-                process['start_time'] = current_time
-
-                start = current_time
-                end = current_time + process['burst_time']
-                timeline.append({
-                    'pid': process['pid'],
-                    'name': process['name'],
-                    'start': start,
-                    'end': end,
-                    'duration': process['burst_time']
-                })
-
-                current_time = end
-                process['end_time'] = end
-                process['status'] = 'Completed'
-
-        self.current_time = current_time
-        self.schedule_history.extend(timeline)
-        return timeline
+        self.set_policy('FCFS')
+        return self.run_to_completion()
+
+    def schedule(self, policy):
+        """Run every remaining process to completion under `policy`"""
+        if not self.process_queue:
+            return "No processes to schedule."
+
+        self.set_policy(policy)
+        return self.run_to_completion()
 
     def round_robin_step(self):
         """Execute one step of Round Robin scheduling"""
-        if not any(p['remaining_time'] > 0 for p in self.process_queue):
+        if self.policy.name != 'RR' or self.policy.quantum != self.quantum:
+            self.set_policy('RR')
+        if self.all_completed():
             return "All processes completed."
 
-        for process in self.process_queue:
-            if process['remaining_time'] > 0:
-                if process['status'] != 'Running':
-                    process['status'] = 'Running'
-                    if process['start_time'] is None:
-                        process['start_time'] = self.current_time
-
-                exec_time = min(self.quantum, process['remaining_time'])
-                start = self.current_time
-                end = start + exec_time
-
-                timeline_entry = {
-                    'pid': process['pid'],
-                    'name': process['name'],
-                    'start': start,
-                    'end': end,
-                    'duration': exec_time
-                }
+        while self.events:
+            timeline = self.step()
+            if timeline:
+                return timeline[0]
 
-                process['remaining_time'] -= exec_time
-                self.current_time = end
+        return "All processes completed."
 
-                if process['remaining_time'] <= 0:
-                    process['status'] = 'Completed'
-                    process['end_time'] = end
-                else:
-                    process['status'] = 'Ready'
+    def load_balance_stats(self):
+        """Work-stealing counters for per-CPU mode"""
+        return {
+            'steals': self.steals,
+            'steal_time': self.steals * self.steal_cost,
+            'balance_seconds': self.balance_seconds,
+        }
 
-                self.schedule_history.append(timeline_entry)
-                return timeline_entry
+    def metrics_stats(self):
+        """Waiting/turnaround percentiles, throughput, utilization and fairness so far"""
+        return self.metrics.summary(self.cores)
 
-        return "No processes ready to execute."
+    def overhead_stats(self):
+        """Simulated time lost to dispatch overheads, by cause"""
+        switch_time = self.context_switches * self.context_switch_cost
+        migration_time = self.migrations * self.migration_cost
+        steal_time = self.steals * self.steal_cost
+        return {
+            'context_switches': self.context_switches,
+            'switch_time': switch_time,
+            'migrations': self.migrations,
+            'migration_time': migration_time,
+            'steals': self.steals,
+            'steal_time': steal_time,
+            'total_overhead': switch_time + migration_time + steal_time,
+        }
 
     def get_process_queue(self):
         """Return the current process queue with details"""
@@ -116,24 +646,133 @@ class ProcessScheduler:
 
     def get_process_details(self, pid):
         """Get detailed information for a specific process"""
-        for process in self.process_queue:
-            if process['pid'] == pid:
-                return process
-        return None
-
-    def visualize_schedule(self):
-        """Generate Gantt chart visualization data"""
-        if not self.schedule_history:
-            return []
-
-        # Create timeline visualization
-        visualization = []
-        for entry in self.schedule_history:
-            visualization.append({
-                'pid': entry['pid'],
-                'name': entry['name'],
-                'start': entry['start'],
-                'end': entry['end'],
-                'duration': entry['duration']
-            })
-        return visualization
\ No newline at end of file
+        row = self.process_queue.row_of(pid)
+        if row is None:
+            return None
+        return self.process_queue[row]
+
+    def get_processes_by_status(self, status):
+        """Return the processes currently in `status` ('Ready', 'Running' or 'Completed')"""
+        rows = self.process_queue.rows_with(STATUS_CODES[status])
+        return [self.process_queue[row] for row in rows]
+
+    def lane_slices(self, cpu, start, end):
+        """Slices of one core keyed for merging by end time"""
+        for pid, slice_start, slice_end in self.lanes[cpu].query(start, end):
+            yield slice_end, cpu, pid, slice_start
+
+    def visualize_schedule(self, start=None, end=None, cpu=None):
+        """Generate Gantt chart visualization data, optionally limited to [start, end) or one `cpu`"""
+        cpus = range(self.cores) if cpu is None else [cpu]
+        streams = [self.lane_slices(lane, start, end) for lane in cpus]
+
+        for slice_end, lane, pid, slice_start in heapq.merge(*streams):
+            process = self.get_process_details(pid)
+            yield {
+                'pid': pid,
+                'name': process['name'] if process is not None else None,
+                'cpu': lane,
+                'start': slice_start,
+                'end': slice_end,
+                'duration': slice_end - slice_start
+            }
+
+
+def lane_spill_path(spill_path, cpu, cores):
+    """Spill file for one core's lane; single-core schedulers use `spill_path` as is"""
+    if spill_path is None or cores == 1:
+        return spill_path
+    return f"{spill_path}.cpu{cpu}"
+
+def sjf_order(arrivals, bursts, start_time=0, by_arrival=None):
+    """Dispatch order of non-preemptive SJF over staggered arrivals (heap walk)"""
+    arrivals = list(arrivals)
+    bursts = list(bursts)
+    n = len(arrivals)
+    if by_arrival is None:
+        by_arrival = sorted(range(n), key=arrivals.__getitem__)
+    # Heap keys are burst * n + rank in arrival order: ints order faster than tuples
+    order = []
+    ready = []
+    clock = start_time
+    i = 0
+    while i < n or ready:
+        if not ready and clock < arrivals[by_arrival[i]]:
+            clock = arrivals[by_arrival[i]]
+        while i < n and arrivals[by_arrival[i]] <= clock:
+            heapq.heappush(ready, bursts[by_arrival[i]] * n + i)
+            i += 1
+        job = by_arrival[heapq.heappop(ready) % n]
+        order.append(job)
+        clock += bursts[job]
+    return order
+
+
+def batch_schedule(arrivals, bursts, policy='FCFS', start_time=0):
+    """Schedule a whole trace of jobs at once with non-preemptive FCFS or SJF"""
+    if policy not in ('FCFS', 'SJF'):
+        raise ValueError("Batch mode supports only 'FCFS' and 'SJF'.")
+    if len(arrivals) != len(bursts):
+        raise ValueError("arrivals and bursts must have the same length.")
+    if not len(arrivals):
+        return {'order': [], 'start': [], 'end': [], 'waiting': [], 'turnaround': [],
+                'avg_waiting': 0, 'avg_turnaround': 0, 'makespan': start_time}
+
+    if np is not None:
+        arrivals = np.asarray(arrivals, dtype=np.int64)
+        bursts = np.asarray(bursts, dtype=np.int64)
+        if policy == 'FCFS':
+            order = np.argsort(arrivals, kind='stable')
+        elif arrivals.min() == arrivals.max():
+            order = np.argsort(bursts, kind='stable')
+        else:
+            by_arrival = np.argsort(arrivals, kind='stable').tolist()
+            order = np.asarray(sjf_order(arrivals.tolist(), bursts.tolist(), start_time, by_arrival),
+                               dtype=np.int64)
+
+        sorted_bursts = bursts[order]
+        finished = np.cumsum(sorted_bursts)
+        slack = np.maximum.accumulate(arrivals[order] - (finished - sorted_bursts))
+        end = np.empty_like(finished)
+        end[order] = finished + np.maximum(slack, start_time)
+        start = end - bursts
+        waiting = start - arrivals
+        turnaround = end - arrivals
+        return {
+            'order': order,
+            'start': start,
+            'end': end,
+            'waiting': waiting,
+            'turnaround': turnaround,
+            'avg_waiting': float(waiting.mean()),
+            'avg_turnaround': float(turnaround.mean()),
+            'makespan': int(end.max()),
+        }
+
+    n = len(arrivals)
+    if policy == 'FCFS':
+        order = sorted(range(n), key=arrivals.__getitem__)
+    elif min(arrivals) == max(arrivals):
+        order = sorted(range(n), key=bursts.__getitem__)
+    else:
+        order = sjf_order(arrivals, bursts, start_time)
+
+    sorted_bursts = [bursts[i] for i in order]
+    finished = list(accumulate(sorted_bursts))
+    slack = accumulate((arrivals[i] - f + b for i, f, b in zip(order, finished, sorted_bursts)), max)
+    end = [0] * n
+    for i, f, s in zip(order, finished, slack):
+        end[i] = f + max(s, start_time)
+    start = [e - b for e, b in zip(end, bursts)]
+    waiting = [s - a for s, a in zip(start, arrivals)]
+    turnaround = [e - a for e, a in zip(end, arrivals)]
+    return {
+        'order': order,
+        'start': start,
+        'end': end,
+        'waiting': waiting,
+        'turnaround': turnaround,
+        'avg_waiting': sum(waiting) / n,
+        'avg_turnaround': sum(turnaround) / n,
+        'makespan': max(end),
+    }
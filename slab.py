@@ -0,0 +1,130 @@
+# slab.py
+SIZE_CLASSES = (1, 2, 4, 8, 16)  # Object sizes in blocks
+SLAB_BLOCKS = 64  # Blocks per slab
+
+
+class Slab:
+    """One run of blocks carved into equal slots of a single size class"""
+    __slots__ = ('start', 'size_class', 'free_slots', 'slot_owners')
+
+    def __init__(self, start, size_class, slots):
+        self.start = start
+        self.size_class = size_class
+        self.free_slots = list(range(slots - 1, -1, -1))  # Stack; lowest slot on top
+        self.slot_owners = [None] * slots
+
+    def used(self):
+        return len(self.slot_owners) - len(self.free_slots)
+
+    def owner_at(self, block):
+        slot = (block - self.start) // self.size_class
+        return self.slot_owners[slot] if slot < len(self.slot_owners) else None
+
+
+class SlabAllocator:
+    """Size-class allocator for small objects, on top of a block arena"""
+
+    def __init__(self, size_classes=SIZE_CLASSES, slab_blocks=SLAB_BLOCKS):
+        size_classes = sorted(size_classes)
+        if not size_classes or size_classes[0] <= 0 or size_classes[-1] > slab_blocks:
+            raise ValueError("Size classes must be positive and fit in one slab.")
+        self.size_classes = size_classes
+        self.slab_blocks = slab_blocks
+        self.clear()
+
+    def clear(self):
+        self.slabs = {}  # Start: Slab
+        self.partial = {c: {} for c in self.size_classes}  # Class: slabs with free slots (dict as ordered set)
+        self.slab_count = {c: 0 for c in self.size_classes}
+        self.object_slab = {}  # Object start: Slab
+
+    def size_class(self, size):
+        """Smallest class that holds `size` blocks, or None if it is too big for a slab"""
+        for size_class in self.size_classes:
+            if size <= size_class:
+                return size_class
+        return None
+
+    def add_slab(self, start, size_class):
+        """Take over the run of slab_blocks blocks at `start` for `size_class` objects"""
+        slab = Slab(start, size_class, self.slab_blocks // size_class)
+        self.slabs[start] = slab
+        self.partial[size_class][start] = slab
+        self.slab_count[size_class] += 1
+
+    def allocate(self, size_class, pid):
+        """Start block of a free slot of `size_class` for `pid`, or None if a new slab is needed"""
+        partial = self.partial[size_class]
+        if not partial:
+            return None
+        slab = next(iter(partial.values()))
+        slot = slab.free_slots.pop()
+        if not slab.free_slots:
+            del partial[slab.start]
+        slab.slot_owners[slot] = pid
+        start = slab.start + slot * size_class
+        self.object_slab[start] = slab
+        return start
+
+    def free(self, start):
+        """Release the object at `start`; return the start of a slab that should go back to the arena, or None"""
+        slab = self.object_slab.pop(start)
+        slot = (start - slab.start) // slab.size_class
+        slab.slot_owners[slot] = None
+        slab.free_slots.append(slot)
+        self.partial[slab.size_class][slab.start] = slab
+
+        if slab.used() == 0 and self.slab_count[slab.size_class] > 1:
+            del self.partial[slab.size_class][slab.start]
+            del self.slabs[slab.start]
+            self.slab_count[slab.size_class] -= 1
+            return slab.start
+        return None
+
+    def relocate(self, moves):
+        """Move slabs by {old start: new start} (during compaction); return {old object start: new start}"""
+        slabs = [self.slabs.pop(old) for old in moves]
+        moved = {}
+        for slab in slabs:
+            new_start = moves[slab.start]
+            for slot, pid in enumerate(slab.slot_owners):
+                if pid is not None:
+                    old = slab.start + slot * slab.size_class
+                    del self.object_slab[old]
+                    moved[old] = new_start + slot * slab.size_class
+            self.partial[slab.size_class].pop(slab.start, None)
+            slab.start = new_start
+
+        # Only reinsert once every moved slab is out: a new start may be another slab's old one
+        for slab in slabs:
+            self.slabs[slab.start] = slab
+            if slab.free_slots:
+                self.partial[slab.size_class][slab.start] = slab
+            for slot, pid in enumerate(slab.slot_owners):
+                if pid is not None:
+                    self.object_slab[slab.start + slot * slab.size_class] = slab
+        return moved
+
+    def stats(self):
+        """Slabs, slots and utilization per size class and overall"""
+        classes = {}
+        total_slots = total_used = 0
+        for size_class in self.size_classes:
+            slabs = [s for s in self.slabs.values() if s.size_class == size_class]
+            slots = sum(len(s.slot_owners) for s in slabs)
+            used = sum(s.used() for s in slabs)
+            classes[size_class] = {
+                'slabs': len(slabs),
+                'slots': slots,
+                'used': used,
+                'utilization': used / slots if slots else 0.0,
+            }
+            total_slots += slots
+            total_used += used
+        return {
+            'slabs': len(self.slabs),
+            'slots': total_slots,
+            'used': total_used,
+            'utilization': total_used / total_slots if total_slots else 0.0,
+            'classes': classes,
+        }
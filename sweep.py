@@ -0,0 +1,96 @@
+# sweep.py
+import itertools
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+from scheduler import ProcessScheduler
+
+COLUMNS = 3  # arrival, burst, priority
+
+# Set in each worker by attach_workload()
+workload_memory = None
+workload_columns = None
+
+
+def share_workload(workload):
+    """Copy (arrival, burst, priority) jobs into one shared-memory block of int64 columns"""
+    columns = [array('q') for _ in range(COLUMNS)]
+    for job in workload:
+        arrival, burst = job[0], job[1]
+        priority = job[2] if len(job) > 2 else 0
+        columns[0].append(arrival)
+        columns[1].append(burst)
+        columns[2].append(priority)
+
+    size = len(columns[0])
+    block = shared_memory.SharedMemory(create=True, size=max(1, size * 8 * COLUMNS))
+    view = block.buf.cast('q')
+    for i, column in enumerate(columns):
+        view[i * size:(i + 1) * size] = column
+    view.release()
+    return block, size
+
+
+def attach_workload(name, size):
+    """Worker initializer: map the shared workload columns"""
+    global workload_memory, workload_columns
+    workload_memory = shared_memory.SharedMemory(name=name)
+    view = workload_memory.buf.cast('q')
+    workload_columns = [view[i * size:(i + 1) * size] for i in range(COLUMNS)]
+
+
+def replay(scheduler, arrivals, bursts, priorities):
+    """Feed jobs to the scheduler in arrival order and run it to completion"""
+    order = sorted(range(len(arrivals)), key=arrivals.__getitem__)
+    scheduler.load_trace((arrivals[i], bursts[i], priorities[i]) for i in order)
+    scheduler.run_to_completion(collect=False)
+
+
+def summarize(scheduler):
+    """Waiting/turnaround statistics, throughput and utilization of a finished run"""
+    return scheduler.metrics_stats()
+
+
+def run_config(config):
+    """Worker task: replay the shared workload under one (policy, quantum, cores)"""
+    policy, quantum, cores, queue_mode, switch_cost, migration_cost = config
+    scheduler = ProcessScheduler(history_limit=1, cores=cores, queue_mode=queue_mode,
+                                 context_switch_cost=switch_cost, migration_cost=migration_cost)
+    scheduler.quantum = quantum
+    scheduler.set_policy(policy)
+    replay(scheduler, *workload_columns)
+    result = {'policy': policy, 'quantum': quantum, 'cores': cores, 'queue_mode': queue_mode}
+    result.update(summarize(scheduler))
+    overhead = scheduler.overhead_stats()
+    result['context_switches'] = overhead['context_switches']
+    result['overhead'] = overhead['total_overhead']
+    return result
+
+
+def run_sweep(workload, policies=('FCFS', 'RR'), quanta=(2,), cores=(1,),
+              queue_mode='global', context_switch_cost=0, migration_cost=0, max_workers=None):
+    """Replay one workload under every (policy, quantum, core count) in parallel"""
+    block, size = share_workload(workload)
+    try:
+        grid = [(policy, quantum, core_count, queue_mode, context_switch_cost, migration_cost)
+                for policy, quantum, core_count in itertools.product(policies, quanta, cores)]
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=attach_workload,
+                                 initargs=(block.name, size)) as pool:
+            return list(pool.map(run_config, grid))
+    finally:
+        block.close()
+        block.unlink()
+
+
+def format_table(results):
+    """Render sweep results as a fixed-width text table"""
+    header = (f"{'policy':<11}{'quantum':>8}{'cores':>6}{'avg_wait':>12}{'p95_wait':>12}{'avg_tat':>12}"
+              f"{'throughput':>12}{'util':>7}{'fair':>7}{'switches':>10}{'overhead':>10}")
+    lines = [header, '-' * len(header)]
+    for r in results:
+        lines.append(f"{r['policy']:<11}{r['quantum']:>8}{r['cores']:>6}"
+                     f"{r['avg_waiting']:>12.2f}{r['p95_waiting']:>12.2f}{r['avg_turnaround']:>12.2f}"
+                     f"{r['throughput']:>12.4f}{r['utilization']:>7.2f}{r['fairness']:>7.3f}"
+                     f"{r['context_switches']:>10}{r['overhead']:>10}")
+    return "\n".join(lines)
@@ -0,0 +1,182 @@
+# test_memory.py
+import random
+
+import pytest
+
+from buddy import BuddyAllocator
+from extents import ExtentTree, FreeExtents
+from memory_manager import COMPACT_SCAN, METHODS, MemoryManager
+
+
+def free_runs(used):
+    """Maximal free runs of a per-block used list as (start, length)"""
+    runs, start = [], None
+    for block, taken in enumerate(used + [True]):
+        if not taken and start is None:
+            start = block
+        elif taken and start is not None:
+            runs.append((start, block - start))
+            start = None
+    return runs
+
+
+def test_extent_tree_matches_sorted_dict():
+    rng = random.Random(1)
+    tree, model = ExtentTree(), {}
+    for _ in range(2000):
+        key = rng.randrange(500)
+        if key in model:
+            tree.remove(key)
+            del model[key]
+        else:
+            length = rng.randint(1, 50)
+            tree.insert(key, length)
+            model[key] = length
+        assert list(tree) == sorted(model.items())
+        assert len(tree) == len(model)
+        probe, length = rng.randrange(520), rng.randint(1, 50)
+        keys = sorted(model)
+        assert tree.ceiling(probe) == next((k for k in keys if k >= probe), None)
+        assert tree.floor(probe) == next((k for k in reversed(keys) if k <= probe), None)
+        assert tree.first_fit(length) == next((k for k in keys if model[k] >= length), None)
+        assert tree.first_fit_from(probe, length) == next(
+            (k for k in keys if k >= probe and model[k] >= length), None)
+
+
+def test_free_extents_fits_and_merges_match_block_model():
+    rng = random.Random(2)
+    total = 300
+    free, used, live = FreeExtents(total), [False] * total, []
+    for _ in range(3000):
+        if live and rng.random() < 0.45:
+            start, size = live.pop(rng.randrange(len(live)))
+            free.free(start, size)
+            used[start:start + size] = [False] * size
+        else:
+            size = rng.randint(1, 30)
+            runs = [run for run in free_runs(used) if run[1] >= size]
+            rover = rng.randrange(total)
+            assert free.first_fit(size) == (runs[0][0] if runs else None)
+            assert free.best_fit(size) == (min(runs, key=lambda r: (r[1], r[0]))[0] if runs else None)
+            assert free.worst_fit(size) == (min(runs, key=lambda r: (-r[1], r[0]))[0] if runs else None)
+            ahead = [start for start, _ in runs if start >= rover]
+            expected = ahead[0] if ahead else (runs[0][0] if runs else None)
+            assert free.next_fit(size, rover) == expected
+            start = free.first_fit(size)
+            if start is not None:
+                free.allocate(start, size)
+                used[start:start + size] = [True] * size
+                live.append((start, size))
+        assert list(free) == free_runs(used)
+        assert free.free_blocks == used.count(False)
+        assert free.largest() == max((r[1] for r in free_runs(used)), default=0)
+
+
+def test_buddy_split_and_merge():
+    rng = random.Random(3)
+    total = 200  # Not a power of two
+    buddy, used, live = BuddyAllocator(total), [False] * total, []
+    for _ in range(3000):
+        if live and rng.random() < 0.45:
+            start, size = live.pop(rng.randrange(len(live)))
+            buddy.free(start, size)
+            used[start:start + size] = [False] * size
+        else:
+            size = buddy.block_size(rng.randint(1, 40))
+            start = buddy.buddy_fit(size)
+            if start is None:
+                continue
+            assert start % size == 0 and start + size <= total
+            assert not any(used[start:start + size])
+            buddy.allocate(start, size)
+            used[start:start + size] = [True] * size
+            live.append((start, size))
+        assert list(buddy) == free_runs(used)
+        assert buddy.free_blocks == used.count(False)
+
+    for start, size in live:
+        buddy.free(start, size)
+    assert list(buddy) == [(0, total)]
+    assert len(buddy) == bin(total).count('1')  # Fully merged: one block per set bit
+
+
+def check_manager(memory):
+    """Compare the manager's indexes with a per-block model built from `processes`"""
+    owners = [None] * memory.total_blocks
+    for pid, proc in memory.processes.items():
+        for block in range(proc['start'], proc['start'] + proc['size']):
+            assert owners[block] is None
+            owners[block] = pid
+    assert memory.block_owners() == owners
+
+    used = [False] * memory.total_blocks
+    for start, size in memory.allocated:
+        used[start:start + size] = [True] * size
+    assert list(memory.free_space) == free_runs(used)
+    assert list(memory.runs()) == sorted((p['start'], p['size'], pid) for pid, p in memory.processes.items())
+
+
+@pytest.mark.parametrize('method', list(METHODS))
+@pytest.mark.parametrize('block_map', [True, False])
+def test_compaction_keeps_allocations_and_packs(method, block_map):
+    rng = random.Random(4)
+    for _ in range(40):
+        memory = MemoryManager(256, allocator=METHODS[method], block_map=block_map, slab_blocks=16)
+        for _ in range(100):
+            if memory.processes and rng.random() < 0.4:
+                memory.release(rng.choice(list(memory.processes)))
+            else:
+                memory.allocate(rng.randint(1, 20), method)
+            if rng.random() < 0.1:
+                limit = rng.choice([None, 1, 8, 32])
+                result = memory.compact_step(limit)
+                assert limit is None or result['moved_blocks'] <= limit or result['moved_extents'] == 1
+            check_manager(memory)
+
+        steps = 0
+        while not memory.compact_step(8)['done']:
+            steps += 1
+            assert steps < 1000
+        check_manager(memory)
+        if memory.allocator == 'extent':
+            free = list(memory.free_space)
+            assert not free or free == [(256 - free[0][1], free[0][1])]
+
+
+def test_bounded_compaction_moves_extent_larger_than_budget():
+    memory = MemoryManager(100)
+    memory.allocate(10)
+    memory.allocate(40)
+    memory.release(1)
+    result = memory.compact_step(8)
+    assert result['moved_blocks'] == 40 and result['done']
+    assert list(memory.free_space) == [(40, 60)]
+
+
+def test_bounded_compaction_scan_is_limited_and_not_repeated():
+    memory = MemoryManager(8 * COMPACT_SCAN, block_map=False)
+    for _ in range(3 * COMPACT_SCAN):
+        memory.allocate(2)
+    steps = 0
+    while not memory.compact_step(1)['done']:
+        steps += 1
+    assert steps == 3  # Packed already: each step only inspects COMPACT_SCAN allocations
+    # The layout is unchanged, so the next call does not start another pass
+    assert memory.compact_step(1) == {'moved_extents': 0, 'moved_blocks': 0, 'moved_bytes': 0, 'done': True}
+
+    memory.release(1)
+    while not memory.compact_step(1)['done']:
+        pass
+    assert list(memory.free_space) == [(2 * (3 * COMPACT_SCAN - 1), memory.free_space.free_blocks)]
+
+
+def test_buddy_holes_are_counted_as_free_runs():
+    memory = MemoryManager(128, allocator='buddy')
+    memory.allocate(1, 'Buddy')
+    assert list(memory.free_space) == [(1, 127)]
+    stats = memory.stats()
+    assert stats['free_holes'] == 1 and stats['largest_free'] == 127 and stats['external'] == 0.0
+    assert stats['largest_block'] == 64
+
+    empty = MemoryManager(100, allocator='buddy')
+    assert empty.fragmentation()['external'] == 0.0
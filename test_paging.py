@@ -0,0 +1,121 @@
+# test_paging.py
+import random
+
+import pytest
+
+from paging import REPLACEMENT_POLICIES, VirtualMemory
+from tlb import TLB
+
+
+def simulate(chunks, frames, policy):
+    """Faults of a per-frame list model; Optimal looks ahead only within the current chunk"""
+    resident, referenced, hand, faults = [], {}, 0, 0
+    for refs in chunks:
+        for i, key in enumerate(refs):
+            if key in resident:
+                if policy == 'LRU':
+                    resident.remove(key)
+                    resident.append(key)
+                referenced[key] = 1
+                continue
+            faults += 1
+            referenced[key] = 1
+            if len(resident) < frames:
+                resident.append(key)
+            elif policy in ('FIFO', 'LRU'):
+                resident.pop(0)
+                resident.append(key)
+            elif policy == 'Clock':
+                while referenced[resident[hand]]:
+                    referenced[resident[hand]] = 0
+                    hand = (hand + 1) % frames
+                resident[hand] = key
+                hand = (hand + 1) % frames
+            else:
+                def next_use(k):
+                    return next((j for j in range(i + 1, len(refs)) if refs[j] == k), len(refs))
+                farthest = max(next_use(k) for k in resident)
+                resident[[next_use(k) for k in resident].index(farthest)] = key
+    return faults
+
+
+@pytest.mark.parametrize('policy', list(REPLACEMENT_POLICIES))
+def test_faults_match_list_model(policy):
+    rng = random.Random(5)
+    for _ in range(100):
+        frames, processes = rng.randint(1, 6), rng.randint(1, 3)
+        chunks = [[(rng.randrange(processes), rng.randrange(10)) for _ in range(rng.randint(1, 60))]
+                  for _ in range(rng.randint(1, 3))]
+        vm = VirtualMemory(frames, policy=policy)
+        for pid in range(processes):
+            vm.add_process(pid, 10)
+        faults = sum(vm.run([page for _, page in refs], [pid for pid, _ in refs]) for refs in chunks)
+        assert faults == simulate(chunks, frames, policy)
+
+
+def test_optimal_rekeys_resident_pages_between_runs():
+    vm = VirtualMemory(2, policy='Optimal')
+    vm.add_process(1, 3)
+    assert vm.run([0, 1], pid=1) == 2
+    assert vm.run([0, 2, 0, 2, 0, 2, 0, 2, 1], pid=1) == 2
+
+
+@pytest.mark.parametrize('policy', ['FIFO', 'LRU', 'Clock'])
+def test_removed_process_frees_its_frames(policy):
+    vm = VirtualMemory(4, policy=policy)
+    vm.add_process(1, 8)
+    vm.add_process(2, 8)
+    vm.run([0, 1, 0, 1], [1, 1, 2, 2])
+    vm.remove_process(1)
+    # Both freed frames are reused before anything of P2 is evicted
+    assert vm.run([2, 3, 4, 5], pid=2) == 4
+    assert vm.evictions == 2
+    assert sum(frame != -1 for frame in vm.page_tables[2]) == 4
+
+
+
+@pytest.mark.parametrize('policy', ['FIFO', 'LRU', 'Clock'])
+def test_tlb_hits_match_set_associative_model(policy):
+    rng = random.Random(6)
+    for _ in range(30):
+        entries, ways = rng.choice([(4, 1), (8, 2), (8, 8)])
+        refs = [(rng.randrange(3), rng.randrange(12)) for _ in range(300)]
+        plain = VirtualMemory(6, policy=policy)
+        vm = VirtualMemory(6, policy=policy, tlb=TLB(entries, ways))
+        for pid in range(3):
+            plain.add_process(pid, 12)
+            vm.add_process(pid, 12)
+        pages, pids = [page for _, page in refs], [pid for pid, _ in refs]
+        assert vm.run(pages, pids) == plain.run(pages, pids)
+
+        # LRU sets of (PID, page); a page evicted from memory leaves the TLB too
+        vm.reset()
+        sets, hits = [[] for _ in range(entries // ways)], 0
+        for pid, page in refs:
+            address = vm.translate(pid, page * vm.page_size)
+            assert address == (vm.pool_start + vm.page_tables[pid][page]) * vm.memory.block_size
+            entry_set = sets[page % len(sets)]
+            if (pid, page) in entry_set:
+                hits += 1
+                entry_set.remove((pid, page))
+            else:
+                for keys in sets:
+                    keys[:] = [(p, g) for p, g in keys if vm.page_tables[p][g] != -1]
+                if len(entry_set) == ways:
+                    entry_set.pop(0)
+            entry_set.append((pid, page))
+        assert vm.tlb.stats()['hits'] == hits
+
+
+def test_tlb_tags_entries_by_process():
+    tlb = TLB(entries=8, ways=2)
+    vm = VirtualMemory(4, tlb=tlb)
+    vm.add_process(1, 4)
+    vm.add_process(2, 4)
+    assert vm.translate(1, 0) != vm.translate(2, 0)
+    assert vm.translate(1, 0) == vm.translate(1, 0)
+    stats = tlb.stats()
+    assert stats['processes'][1]['hits'] == 2 and stats['processes'][2]['hits'] == 0
+    tlb.flush(tlb.asid(1))
+    vm.translate(1, 0)
+    assert tlb.stats()['processes'][1]['misses'] == 2
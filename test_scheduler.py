@@ -0,0 +1,266 @@
+# test_scheduler.py
+import random
+from collections import deque
+
+import pytest
+
+from scheduler import ProcessScheduler, batch_schedule
+from timeline import TimelineSink
+
+
+def random_trace(rng, jobs=30, spread=40, max_burst=9):
+    arrivals = sorted(rng.randrange(spread) for _ in range(jobs))
+    return [(arrival, rng.randint(1, max_burst), rng.randrange(4)) for arrival in arrivals]
+
+
+def run_trace(trace, policy, quantum=2, **options):
+    """Every slice of `trace` replayed under `policy`, plus the scheduler"""
+    scheduler = ProcessScheduler(history_detail=True, **options)
+    scheduler.quantum = quantum
+    scheduler.set_policy(policy)
+    scheduler.load_trace(trace)
+    return scheduler.run_to_completion(), scheduler
+
+
+def end_times(scheduler):
+    return [p['end_time'] for p in sorted(scheduler.process_queue, key=lambda p: p['pid'])]
+
+
+@pytest.mark.parametrize('policy', ['FCFS', 'SJF'])
+def test_engine_matches_batch_schedule(policy):
+    rng = random.Random(6)
+    for _ in range(50):
+        trace = random_trace(rng)
+        _, scheduler = run_trace(trace, policy)
+        batch = batch_schedule([job[0] for job in trace], [job[1] for job in trace], policy)
+        assert end_times(scheduler) == list(batch['end'])
+
+
+def test_round_robin_matches_tick_model():
+    rng = random.Random(7)
+    for _ in range(50):
+        trace, quantum = random_trace(rng), rng.randint(1, 4)
+        _, scheduler = run_trace(trace, 'RR', quantum)
+
+        # One tick at a time; an expired process goes behind the arrivals of the same tick
+        remaining = [burst for _, burst, _ in trace]
+        end = [None] * len(trace)
+        ready, running, used, arrived, t = deque(), None, 0, 0, 0
+        while None in end:
+            while arrived < len(trace) and trace[arrived][0] == t:
+                ready.append(arrived)
+                arrived += 1
+            if running is not None and (not remaining[running] or used == quantum):
+                if remaining[running]:
+                    ready.append(running)
+                else:
+                    end[running] = t
+                running = None
+            if running is None and ready:
+                running, used = ready.popleft(), 0
+            if running is not None:
+                remaining[running] -= 1
+                used += 1
+            t += 1
+        assert end_times(scheduler) == end
+
+
+def test_per_cpu_stealing_keeps_cores_busy():
+    jobs = [(0, 10 if i % 2 == 0 else 1) for i in range(400)]
+    makespans = {}
+    for mode in ('global', 'per-cpu'):
+        scheduler = ProcessScheduler(cores=2, queue_mode=mode)
+        scheduler.load_trace(jobs)
+        scheduler.run_to_completion(collect=False)
+        makespans[mode] = scheduler.current_time
+        if mode == 'per-cpu':
+            assert scheduler.steals > 1
+    assert makespans['per-cpu'] == makespans['global'] == 1100
+
+
+def make_spill_scheduler(path):
+    scheduler = ProcessScheduler(spill_path=str(path), history_detail=True)
+    scheduler.quantum = 2
+    scheduler.set_policy('RR')
+    for burst in (6, 3, 8, 2):
+        scheduler.add_process(f"P{burst}", burst)
+    return scheduler
+
+
+def test_restored_branch_keeps_its_own_spill_file(tmp_path):
+    original = make_spill_scheduler(tmp_path / "main.bin")
+    original.run_until(5)
+    data = original.checkpoint()
+
+    with pytest.raises(ValueError):
+        ProcessScheduler.restore(data)
+
+    branch = ProcessScheduler.restore(data, spill_path=str(tmp_path / "branch.bin"))
+    branch.schedule('SJF')
+    expected = list(branch.visualize_schedule())
+    original.run_to_completion()
+
+    assert list(branch.visualize_schedule()) == expected
+    ran = {}
+    for entry in expected:
+        ran[entry['pid']] = ran.get(entry['pid'], 0) + entry['duration']
+    assert ran == {1: 6, 2: 3, 3: 8, 4: 2}
+    assert list(original.visualize_schedule()) != expected
+
+
+def test_pinned_arrivals_wake_another_core_to_steal():
+    scheduler = ProcessScheduler(cores=2, queue_mode='per-cpu')
+    scheduler.load_trace([(0, 5, 0, 0), (0, 5, 0, 0), (7, 5, 0, 0), (7, 5, 0, 0)])
+    slices = [(s['pid'], s['cpu'], s['start']) for s in scheduler.run_to_completion()]
+    assert sorted(slices) == [(1, 0, 0), (2, 1, 0), (3, 0, 7), (4, 1, 7)]
+    assert scheduler.current_time == 12
+
+
+def test_status_index_matches_status_column():
+    scheduler = ProcessScheduler(cores=2)
+    scheduler.quantum = 3
+    scheduler.set_policy('RR')
+    scheduler.load_trace([(i // 3, 1 + i % 7) for i in range(60)], retain_completed=False)
+    table = scheduler.process_queue
+    while scheduler.events:
+        scheduler.step()
+        for code, name in enumerate(('Ready', 'Running', 'Completed')):
+            expected = [row for row in range(len(table.pid)) if table.status[row] == code]
+            assert table.rows_with(code) == expected
+            assert [p['pid'] for p in scheduler.get_processes_by_status(name)] == [table.pid[r] for r in expected]
+
+
+def check_slices(trace, slices, cores=1):
+    """Each job runs exactly its burst, after arrival, on one core at a time, and no core idles while work waits"""
+    ran, end, running = [0] * len(trace), [0] * len(trace), {}
+    for entry in slices:
+        job = entry['pid'] - 1
+        assert entry['start'] >= trace[job][0]
+        ran[job] += entry['duration']
+        end[job] = max(end[job], entry['end'])
+        for t in range(entry['start'], entry['end']):
+            running.setdefault(t, []).append((entry['cpu'], job))
+    assert ran == [burst for _, burst, *_ in trace]
+
+    for t in range(max(end)):
+        cpus, jobs = zip(*running.get(t, [])) if t in running else ((), ())
+        assert len(set(cpus)) == len(cpus) and len(set(jobs)) == len(jobs)
+        waiting = sum(1 for job, (arrival, *_) in enumerate(trace) if arrival <= t < end[job])
+        assert len(jobs) == min(cores, waiting)
+
+
+@pytest.mark.parametrize('policy', ['FCFS', 'RR', 'SJF', 'SRTF', 'Priority', 'Priority-P', 'MLFQ'])
+def test_policies_run_every_burst_without_idling(policy):
+    rng = random.Random(8)
+    for _ in range(30):
+        trace = random_trace(rng)
+        slices, _ = run_trace(trace, policy, rng.randint(1, 4))
+        check_slices(trace, slices)
+
+
+def test_srtf_reaches_the_optimal_total_turnaround():
+    rng = random.Random(9)
+    for _ in range(50):
+        trace = random_trace(rng)
+        _, scheduler = run_trace(trace, 'SRTF')
+
+        # Shortest remaining processing time, decided every tick, minimizes the sum of end times
+        remaining = [burst for _, burst, _ in trace]
+        total, t = 0, 0
+        while any(remaining):
+            ready = [job for job, (arrival, _, _) in enumerate(trace) if arrival <= t and remaining[job]]
+            if ready:
+                job = min(ready, key=remaining.__getitem__)
+                remaining[job] -= 1
+                if not remaining[job]:
+                    total += t + 1
+            t += 1
+        assert sum(end_times(scheduler)) == total
+
+
+@pytest.mark.parametrize('preemptive', [False, True])
+def test_priority_runs_the_most_urgent_ready_process(preemptive):
+    rng = random.Random(10)
+    for _ in range(30):
+        trace = random_trace(rng)
+        slices, scheduler = run_trace(trace, 'Priority-P' if preemptive else 'Priority')
+        ends = end_times(scheduler)
+        for entry in slices:
+            job = entry['pid'] - 1
+            # Preemptive: nobody more urgent is waiting during the slice; otherwise only at its start
+            times = range(entry['start'], entry['end']) if preemptive else [entry['start']]
+            for t in times:
+                for other, (arrival, _, priority) in enumerate(trace):
+                    if other != job and arrival <= t < ends[other]:
+                        assert priority >= trace[job][2]
+
+
+@pytest.mark.parametrize('spill', [False, True])
+def test_timeline_keeps_recent_slices_and_answers_window_queries(tmp_path, spill):
+    rng = random.Random(11)
+    sink = TimelineSink(capacity=50, spill_path=str(tmp_path / "lane.bin") if spill else None)
+    slices, t = [], 0
+    for _ in range(300):
+        t += rng.randrange(3)
+        duration = rng.randint(1, 6)
+        slices.append((rng.randint(1, 5), t, t + duration))
+        sink.append(*slices[-1])
+        t += duration
+
+    assert len(sink) == 300 and sink.buffered() == 50
+    assert list(sink.recent()) == slices[-50:]
+    retained = slices if spill else slices[-50:]
+    assert list(sink) == retained
+    for _ in range(100):
+        start = rng.randrange(t)
+        end = start + rng.randint(1, 40)
+        assert list(sink.query(start, end)) == [s for s in retained if s[2] > start and s[1] < end]
+    sink.close()
+
+
+def test_timeline_coalesces_back_to_back_slices():
+    sink = TimelineSink(coalesce=True)
+    for pid, start, end in ((1, 0, 2), (1, 2, 4), (2, 4, 5), (1, 6, 8), (1, 8, 9)):
+        sink.append(pid, start, end)
+    assert list(sink) == [(1, 0, 4), (2, 4, 5), (1, 6, 9)]
+    assert len(sink) == 3
+
+    scheduler = ProcessScheduler()
+    scheduler.quantum = 2
+    scheduler.set_policy('RR')
+    scheduler.add_process("solo", 9)
+    assert len(scheduler.run_to_completion()) == 5  # Every quantum is still reported
+    assert [(s['start'], s['end']) for s in scheduler.visualize_schedule()] == [(0, 9)]
+
+
+@pytest.mark.parametrize('queue_mode', ['global', 'per-cpu'])
+@pytest.mark.parametrize('policy', ['FCFS', 'RR', 'SJF', 'SRTF', 'MLFQ'])
+def test_multi_core_runs_every_burst_without_idling(policy, queue_mode):
+    rng = random.Random(12)
+    for _ in range(20):
+        cores = rng.randint(2, 4)
+        trace = random_trace(rng, jobs=40, spread=30)
+        slices, _ = run_trace(trace, policy, rng.randint(1, 4), cores=cores, queue_mode=queue_mode)
+        check_slices(trace, slices, cores)
+
+
+@pytest.mark.parametrize('queue_mode', ['global', 'per-cpu'])
+def test_restored_checkpoint_continues_like_the_original(queue_mode):
+    trace = random_trace(random.Random(13), jobs=60, spread=50)
+    expected, _ = run_trace(trace, 'SRTF', cores=2, queue_mode=queue_mode)
+
+    scheduler = ProcessScheduler(history_detail=True, cores=2, queue_mode=queue_mode)
+    scheduler.set_policy('SRTF')
+    scheduler.load_trace(iter(trace))
+    before = scheduler.run_until(20)
+    data = scheduler.checkpoint()
+    with pytest.raises(ValueError):
+        ProcessScheduler.restore(data)  # Mid-trace: the trace must be passed again
+
+    branches = [ProcessScheduler.restore(data, trace) for _ in range(2)]
+    branches[1].set_policy('FCFS')
+    branches[1].run_to_completion()
+    rest = branches[0].run_to_completion()
+    key = lambda s: (s['start'], s['cpu'])
+    assert sorted(before + rest, key=key) == sorted(expected, key=key)
+    assert scheduler.current_time == 20 and not scheduler.all_completed()
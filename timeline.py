@@ -0,0 +1,181 @@
+# timeline.py
+import shutil
+import struct
+from array import array
+from bisect import bisect_right
+
+# One executed slice on disk: pid, start, end
+RECORD = struct.Struct('<qqq')
+READ_CHUNK = 4096  # Records per read when streaming the spill file
+
+
+class TimelineSink:
+    """Bounded store for the slices a scheduler executes, optionally spilled to disk"""
+
+    def __init__(self, capacity=None, spill_path=None, coalesce=False):
+        self.spill = None
+        if capacity is not None and capacity <= 0:
+            raise ValueError("Timeline capacity must be positive.")
+        self.capacity = capacity
+        self.coalesce = coalesce
+        self.spill_path = spill_path
+        if spill_path:
+            self.spill = open(spill_path, 'w+b')
+        self.clear()
+
+    def clear(self):
+        self.pids = array('q')
+        self.starts = array('q')
+        self.ends = array('q')
+        self.head = 0  # Oldest buffered slice once the ring has wrapped
+        self.count = 0  # Records (merged slices count once) since the last clear
+        self.max_duration = 0
+        self.pending = None  # Newest record, not yet written to the spill file
+        if self.spill:
+            self.spill.seek(0)
+            self.spill.truncate()
+
+    def append(self, pid, start, end):
+        """Record one executed slice"""
+        if self.coalesce and self.pids:
+            last = (self.head - 1) % len(self.pids)
+            if self.pids[last] == pid and self.ends[last] == start:
+                self.ends[last] = end
+                start = self.starts[last]
+                self.max_duration = max(self.max_duration, end - start)
+                if self.spill:
+                    self.pending = (pid, start, end)
+                return
+
+        if self.capacity is None or len(self.pids) < self.capacity:
+            self.pids.append(pid)
+            self.starts.append(start)
+            self.ends.append(end)
+        else:
+            self.pids[self.head] = pid
+            self.starts[self.head] = start
+            self.ends[self.head] = end
+            self.head = (self.head + 1) % self.capacity
+        self.count += 1
+        self.max_duration = max(self.max_duration, end - start)
+        if self.spill:
+            if self.pending:
+                self.spill.write(RECORD.pack(*self.pending))
+            self.pending = (pid, start, end)
+
+    def close(self):
+        if self.spill:
+            if self.pending:
+                self.spill.write(RECORD.pack(*self.pending))
+                self.pending = None
+            self.spill.close()
+            self.spill = None
+
+    def __len__(self):
+        return self.count
+
+    def buffered(self):
+        """Number of slices held in memory"""
+        return len(self.pids)
+
+    def buffer_slice(self, i):
+        """The i-th oldest buffered slice as (pid, start, end)"""
+        i = (self.head + i) % len(self.pids)
+        return self.pids[i], self.starts[i], self.ends[i]
+
+    def recent(self):
+        """Yield the buffered slices, oldest first"""
+        for i in range(len(self.pids)):
+            yield self.buffer_slice(i)
+
+    def file_slices(self, first=0):
+        """Yield slices from the spill file starting at record `first`"""
+        self.spill.flush()
+        pending = self.pending
+        with open(self.spill_path, 'rb') as f:
+            f.seek(first * RECORD.size)
+            while True:
+                chunk = f.read(READ_CHUNK * RECORD.size)
+                if not chunk:
+                    break
+                yield from RECORD.iter_unpack(chunk)
+        if pending and first < self.count:
+            yield pending
+
+    def first_ending_after(self, t):
+        """Index of the first spilled record whose end is after t"""
+        self.spill.flush()
+        written = self.count - 1 if self.pending else self.count
+        lo, hi = 0, written
+        with open(self.spill_path, 'rb') as f:
+            while lo < hi:
+                mid = (lo + hi) // 2
+                f.seek(mid * RECORD.size)
+                if RECORD.unpack(f.read(RECORD.size))[2] <= t:
+                    lo = mid + 1
+                else:
+                    hi = mid
+        if lo == written and self.pending and self.pending[2] <= t:
+            lo += 1
+        return lo
+
+    def __iter__(self):
+        """Yield every retained slice as (pid, start, end)"""
+        if self.spill:
+            return self.file_slices()
+        return self.recent()
+
+    def query(self, start=None, end=None):
+        """Yield retained slices overlapping [start, end) as (pid, start, end)"""
+        if start is None and end is None:
+            yield from self
+            return
+
+        if self.spill:
+            first = self.first_ending_after(start) if start is not None else 0
+            source = self.file_slices(first)
+        else:
+            first = 0
+            if start is not None:
+                first = bisect_right(range(len(self.pids)), start,
+                                     key=lambda i: self.buffer_slice(i)[2])
+            source = (self.buffer_slice(i) for i in range(first, len(self.pids)))
+
+        for pid, slice_start, slice_end in source:
+            if end is not None and slice_start >= end:
+                # Later slices end no earlier; once one ends past
+                # end + max_duration none of them can start before end
+                if slice_end >= end + self.max_duration:
+                    return
+                continue
+            yield pid, slice_start, slice_end
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['spill'] = None
+        state['spilled_bytes'] = 0
+        if self.spill:
+            self.spill.flush()
+            state['spilled_bytes'] = self.spill.tell()
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+
+    def resume_spill(self, path):
+        """Continue spilling into a copy of the spill file at `path`, cut back to the pickled length"""
+        spilled_bytes = self.__dict__.pop('spilled_bytes', 0)
+        if not self.spill_path:
+            return
+        if not path or path == self.spill_path:
+            # The original run may still be writing its file
+            raise ValueError("A restored timeline needs a spill file of its own.")
+        with open(self.spill_path, 'rb') as source, open(path, 'wb') as target:
+            shutil.copyfileobj(source, target)
+        self.spill = open(path, 'r+b')
+        self.spill.truncate(spilled_bytes)
+        self.spill.seek(spilled_bytes)
+        self.spill_path = path
+
+    def __del__(self):
+        self.close()
@@ -0,0 +1,136 @@
+# tlb.py
+from array import array
+
+TLB_REPLACEMENT = ('LRU', 'Random')
+ASID_SHIFT = 40  # Entry key: ASID above the virtual page number
+EMPTY = -1
+
+
+class TLB:
+    """Set-associative translation lookaside buffer tagged by ASID"""
+
+    def __init__(self, entries=64, ways=4, replacement='LRU', hit_time=1, memory_time=100,
+                 walk_levels=1, seed=1):
+        if entries <= 0 or ways <= 0 or entries % ways:
+            raise ValueError("TLB entries must be a positive multiple of the associativity.")
+        if replacement not in TLB_REPLACEMENT:
+            raise ValueError(f"Unknown TLB replacement '{replacement}'.")
+        self.entries = entries
+        self.ways = ways
+        self.sets = entries // ways
+        self.replacement = replacement
+        self.hit_time = hit_time
+        self.memory_time = memory_time
+        self.walk_levels = walk_levels
+        self.seed = seed
+        self.asids = {}  # PID: ASID
+        self.hits = array('q')  # Per ASID
+        self.misses = array('q')
+        self.clear()
+
+    @property
+    def miss_penalty(self):
+        return self.walk_levels * self.memory_time
+
+    def clear(self):
+        """Drop every entry and zero the counters (ASIDs are kept)"""
+        self.keys = array('q', [EMPTY]) * self.entries
+        self.frames = array('i', [0]) * self.entries
+        self.stamps = array('q', [0]) * self.entries
+        self.used = array('i', [0]) * self.sets  # Filled slots per set
+        self.slots = {}  # Key: slot
+        self.clock = 0
+        self.rng_state = self.seed
+        self.hits = array('q', [0]) * len(self.asids)
+        self.misses = array('q', [0]) * len(self.asids)
+
+    def asid(self, pid):
+        """ASID of `pid`, assigning the next free one on first use"""
+        asid = self.asids.get(pid)
+        if asid is None:
+            asid = self.asids[pid] = len(self.asids)
+            self.hits.append(0)
+            self.misses.append(0)
+        return asid
+
+    def lookup(self, asid, vpn):
+        """Frame of page `vpn` of `asid`, or EMPTY on a miss"""
+        slot = self.slots.get(asid << ASID_SHIFT | vpn, EMPTY)
+        if slot == EMPTY:
+            self.misses[asid] += 1
+            return EMPTY
+        self.hits[asid] += 1
+        self.clock += 1
+        self.stamps[slot] = self.clock
+        return self.frames[slot]
+
+    def fill(self, asid, vpn, frame):
+        """Cache the translation after a miss, replacing an entry of its set if full"""
+        keys, stamps, ways = self.keys, self.stamps, self.ways
+        set_index = vpn % self.sets
+        base = set_index * ways
+        if self.used[set_index] < ways:
+            slot = keys.index(EMPTY, base, base + ways)
+            self.used[set_index] += 1
+        else:
+            if self.replacement == 'LRU':
+                slot = stamps.index(min(stamps[base:base + ways]), base)
+            else:
+                self.rng_state = (self.rng_state * 1103515245 + 12345) & 0x7FFFFFFF
+                slot = base + (self.rng_state >> 16) % ways
+            del self.slots[keys[slot]]
+
+        key = asid << ASID_SHIFT | vpn
+        keys[slot] = key
+        self.frames[slot] = frame
+        self.clock += 1
+        stamps[slot] = self.clock
+        self.slots[key] = slot
+
+    def invalidate(self, asid, vpn):
+        """Drop the entry of one page (after it is evicted from memory)"""
+        slot = self.slots.pop(asid << ASID_SHIFT | vpn, EMPTY)
+        if slot != EMPTY:
+            self.keys[slot] = EMPTY
+            self.used[slot // self.ways] -= 1
+
+    def flush(self, asid=None):
+        """Drop every entry, or only those of one ASID"""
+        if asid is None:
+            self.keys[:] = array('q', [EMPTY]) * self.entries
+            self.used[:] = array('i', [0]) * self.sets
+            self.slots.clear()
+            return
+        for key, slot in list(self.slots.items()):
+            if key >> ASID_SHIFT == asid:
+                del self.slots[key]
+                self.keys[slot] = EMPTY
+                self.used[slot // self.ways] -= 1
+
+    def effective_access_time(self, hit_rate):
+        """Average ns per memory reference at `hit_rate`"""
+        return self.hit_time + self.memory_time + (1 - hit_rate) * self.miss_penalty
+
+    def stats(self):
+        """Hit rate, miss penalty and effective access time, overall and per PID"""
+        def summary(hits, misses):
+            lookups = hits + misses
+            hit_rate = hits / lookups if lookups else 0.0
+            return {
+                'lookups': lookups,
+                'hits': hits,
+                'misses': misses,
+                'hit_rate': hit_rate,
+                'miss_penalty': self.miss_penalty,
+                'effective_access_time': self.effective_access_time(hit_rate) if lookups else 0.0,
+            }
+
+        result = summary(sum(self.hits), sum(self.misses))
+        result.update({
+            'entries': self.entries,
+            'ways': self.ways,
+            'replacement': self.replacement,
+            'processes': {pid: summary(self.hits[asid], self.misses[asid])
+                          for pid, asid in self.asids.items()},
+        })
+        return result
@@ -0,0 +1,116 @@
+# workload.py
+import csv
+import math
+import random
+import struct
+
+# Binary trace: an 8-byte magic followed by fixed-size little-endian
+# records of (arrival, burst, priority, cpu)
+MAGIC = b'MOSTRC01'
+RECORD = struct.Struct('<qqii')
+READ_CHUNK = 4096  # Records per read
+
+CSV_COLUMNS = ('arrival', 'burst', 'priority', 'cpu')
+NO_CPU = -1  # No core preference
+
+
+def read_csv_trace(path):
+    """Yield (arrival, burst, priority, cpu) jobs from a CSV trace, one row at a time"""
+    with open(path, newline='') as f:
+        reader = csv.reader(f)
+        positions = list(range(len(CSV_COLUMNS)))
+        first = True
+        for row in reader:
+            if not row or row[0].startswith('#'):
+                continue
+            is_header = first and not row[0].strip().lstrip('-').isdigit()
+            first = False
+            if is_header:
+                header = [cell.strip().lower() for cell in row]
+                positions = [header.index(c) if c in header else None for c in CSV_COLUMNS]
+                if positions[0] is None or positions[1] is None:
+                    raise ValueError(f"Trace '{path}' needs arrival and burst columns.")
+                continue
+
+            values = [int(row[p]) if p is not None and p < len(row) and row[p].strip() else None
+                      for p in positions]
+            yield (values[0], values[1],
+                   values[2] if values[2] is not None else 0,
+                   values[3] if values[3] is not None else NO_CPU)
+
+
+def write_csv_trace(path, jobs):
+    """Write jobs to a CSV trace with a header row; return the number written"""
+    count = 0
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(CSV_COLUMNS)
+        for job in jobs:
+            writer.writerow(normalize(job))
+            count += 1
+    return count
+
+
+def read_binary_trace(path):
+    """Yield (arrival, burst, priority, cpu) jobs from a binary trace in fixed-size chunks"""
+    with open(path, 'rb') as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"'{path}' is not a MiniOS binary trace.")
+        while True:
+            chunk = f.read(READ_CHUNK * RECORD.size)
+            if not chunk:
+                return
+            if len(chunk) % RECORD.size:
+                raise ValueError(f"Trace '{path}' ends with a partial record.")
+            yield from RECORD.iter_unpack(chunk)
+
+
+def write_binary_trace(path, jobs):
+    """Write jobs to a binary trace; return the number written"""
+    count = 0
+    with open(path, 'wb') as f:
+        f.write(MAGIC)
+        batch = []
+        for job in jobs:
+            batch.append(RECORD.pack(*normalize(job)))
+            count += 1
+            if len(batch) == READ_CHUNK:
+                f.write(b''.join(batch))
+                batch = []
+        f.write(b''.join(batch))
+    return count
+
+
+def read_trace(path):
+    """Open a trace by extension: .csv is text, anything else is binary"""
+    if str(path).lower().endswith('.csv'):
+        return read_csv_trace(path)
+    return read_binary_trace(path)
+
+
+def normalize(job):
+    """Pad a (arrival, burst[, priority[, cpu]]) job to four fields"""
+    arrival, burst = job[0], job[1]
+    priority = job[2] if len(job) > 2 else 0
+    cpu = job[3] if len(job) > 3 else NO_CPU
+    return arrival, burst, priority, cpu
+
+
+def poisson_workload(count, rate=1.0, mean_burst=10, burst_distribution='exponential',
+                     pareto_alpha=1.5, priorities=1, seed=None):
+    """Yield `count` synthetic jobs with Poisson arrivals"""
+    if burst_distribution not in ('exponential', 'pareto'):
+        raise ValueError("Burst distribution must be 'exponential' or 'pareto'.")
+    if burst_distribution == 'pareto' and pareto_alpha <= 1:
+        raise ValueError("Pareto shape must exceed 1 for the mean to exist.")
+
+    rng = random.Random(seed)
+    scale = mean_burst * (pareto_alpha - 1) / pareto_alpha
+    clock = 0.0
+    for _ in range(count):
+        clock += rng.expovariate(rate)
+        if burst_distribution == 'exponential':
+            burst = rng.expovariate(1 / mean_burst)
+        else:
+            burst = scale * rng.paretovariate(pareto_alpha)
+        yield int(clock), max(1, math.ceil(burst)), rng.randrange(priorities), NO_CPU